@@ -2,7 +2,7 @@ import warnings
 from argparse import ArgumentParser
 from os import makedirs
 
-from . import build, formal, rom, test, vsh
+from . import bench, build, formal, replay, rom, test, trace, vsh
 from .base import path
 
 warnings.simplefilter("default")
@@ -36,6 +36,24 @@ rom.add_main_arguments(
         help="build the ROM image, and optionally program it",
     )
 )
+bench.add_main_arguments(
+    subparsers.add_parser(
+        "bench",
+        help="measure OLED command throughput in simulation",
+    )
+)
+trace.add_main_arguments(
+    subparsers.add_parser(
+        "trace",
+        help="count cycles spent in each FSM state, per command, from a VCD",
+    )
+)
+replay.add_main_arguments(
+    subparsers.add_parser(
+        "replay",
+        help="decode a capture of the I²C bus and render what the display shows",
+    )
+)
 vsh.add_main_arguments(
     subparsers.add_parser(
         "vsh",
@@ -0,0 +1,261 @@
+import json
+import sys
+from argparse import ArgumentParser, Namespace
+from typing import Any, Final, NamedTuple, Optional, cast
+
+from amaranth import Elaboratable, Module
+from amaranth.hdl import Fragment
+from amaranth.lib.wiring import Component, In
+from amaranth.sim import Delay, Simulator, Tick
+
+from . import rom, sim
+from .platform import Platform
+from .rtl.common import Hz
+from .rtl.i2c import PerfCounter
+from .rtl.oled import OLED
+from .rtl.spi.sim_spi import SPIFlashPeripheral
+from .trace import trace_sim
+
+__all__ = ["add_main_arguments", "BenchTop", "CASES"]
+
+Cm = OLED.Command
+
+
+class Case(NamedTuple):
+    name: str
+    # Run untimed first, to put the OLED into the right state.
+    setup: list[int]
+    cmd: list[int]
+    # Characters put on the display, for chars/sec.
+    chars: int = 0
+
+
+def _print(s: str) -> list[int]:
+    return [Cm.PRINT, len(s), *(ord(c) for c in s)]
+
+
+CASES: Final[list[Case]] = [
+    Case("NOP", [], [Cm.NOP]),
+    Case("INIT", [], [Cm.INIT]),
+    Case("DISPLAY_OFF", [], [Cm.DISPLAY_OFF]),
+    Case("DISPLAY_ON", [], [Cm.DISPLAY_ON]),
+    Case("CLS", [], [Cm.CLS]),
+    Case("LOCATE", [], [Cm.LOCATE, 8, 8]),
+    Case("PRINT", [Cm.LOCATE, 1, 1], _print("0123456789abcdef"), 16),
+    Case("PRINT: WRAP", [Cm.LOCATE, 1, 9], _print("0123456789abcdef"), 16),
+    Case("PRINT: NEWLINES", [Cm.LOCATE, 1, 1], _print("ab\ncd\nef\ngh\n"), 8),
+    Case("PRINT: SCROLL", [Cm.LOCATE, 16, 1], _print("a\n"), 1),
+    Case("PRINT_BYTE", [Cm.LOCATE, 1, 1], [Cm.PRINT_BYTE, 0xA5], 2),
+    Case("CURSOR_ON", [], [Cm.CURSOR_ON]),
+    Case("CURSOR_OFF", [], [Cm.CURSOR_OFF]),
+    Case("ID", [Cm.LOCATE, 1, 1], [Cm.ID], 2),
+    Case("SPI_TEST", [Cm.LOCATE, 1, 1], [Cm.SPI_TEST], 64),
+    Case("BLIT", [], [Cm.BLIT, 4, 32, 1, 16, *range(16)]),
+    Case("FILL_RECT", [], [Cm.FILL_RECT, 0, 0, 2, 128, 0xFF]),
+]
+
+
+class BenchTop(Component):
+    """
+    An OLED with a flash holding the real ROM, and a display that ACKs
+    everything.  The I2C controller's counters are read through
+    oled.i2c_counters.
+    """
+
+    _oled: OLED
+    _flash: SPIFlashPeripheral
+
+    done: In(1)
+
+    def __init__(self, *, platform: Platform, speed: Hz):
+        super().__init__()
+        self._oled = OLED(platform=platform, speed=speed, i2c_counters=True)
+        self._flash = SPIFlashPeripheral(
+            data=rom.ROM_CONTENT, base=platform.flash_rom_base
+        )
+
+    def elaborate(self, platform: Platform) -> Elaboratable:
+        m = Module()
+
+        m.submodules.oled = oled = self._oled
+        m.submodules.flash = flash = self._flash
+
+        spi = oled._spifr.spi
+        i2c = oled._i2c
+        m.d.comb += [
+            flash.spi.copi.eq(spi.copi),
+            spi.cipo.eq(flash.spi.cipo),
+            flash.spi.cs.eq(spi.cs),
+            flash.spi.clk.eq(spi.clk),
+            i2c.hw_bus.sda_i.eq(0),
+            self.done.eq(
+                oled._idle & (oled.cmd_bus.w_level == 0) & ~oled.i2c_bus.busy
+            ),
+        ]
+
+        return m
+
+
+def run(
+    speed: int, cases: list[Case], *, trace: Optional[str] = None
+) -> list[dict[str, Any]]:
+    platform = Platform["test"]
+    freq = cast(int, platform.default_clk_frequency)
+    dut = BenchTop(platform=platform, speed=Hz(speed))
+    results: list[dict[str, Any]] = []
+
+    def feed(data: list[int]) -> sim.Generator[int]:
+        cycles = 0
+        yield dut._oled.cmd_bus.w_en.eq(1)
+        for b in data:
+            yield dut._oled.cmd_bus.w_data.eq(b)
+            assert (yield dut._oled.cmd_bus.w_rdy)
+            yield Tick()
+            cycles += 1
+        yield dut._oled.cmd_bus.w_en.eq(0)
+        while not (yield dut.done):
+            yield Tick()
+            cycles += 1
+        return cycles
+
+    def counters() -> sim.Generator[dict[PerfCounter, int]]:
+        values: dict[PerfCounter, int] = {}
+        for counter in PerfCounter:
+            yield dut._oled.i2c_counters.addr.eq(counter)
+            yield Delay()
+            values[counter] = yield dut._oled.i2c_counters.data
+        return values
+
+    def bench() -> sim.Procedure:
+        while (yield dut._oled.result) == OLED.Result.BUSY:
+            yield Tick()
+
+        for case in cases:
+            yield from feed(case.setup)
+            yield dut._oled.i2c_counters.clr.eq(1)
+            yield Tick()
+            yield dut._oled.i2c_counters.clr.eq(0)
+            cycles = yield from feed(case.cmd)
+            perf = yield from counters()
+            seconds = cycles / freq
+            result: dict[str, Any] = {
+                "command": case.name,
+                "speed": speed,
+                "cycles": cycles,
+                "bus_bytes": perf[PerfCounter.BYTES],
+                "seconds": round(seconds, 9),
+            }
+            if case.chars:
+                result["chars_per_sec"] = round(case.chars / seconds, 1)
+            result.update(
+                {
+                    "starts": perf[PerfCounter.STARTS],
+                    "rep_starts": perf[PerfCounter.REP_STARTS],
+                    # Cycles with the bus free while the command ran.
+                    "bus_idle_cycles": perf[PerfCounter.IDLE_CYCLES],
+                    "fifo_stall_cycles": perf[PerfCounter.STALL_CYCLES],
+                }
+            )
+            results.append(result)
+
+    fragment = Fragment.get(dut, platform)
+    simulator = Simulator(fragment)
+    simulator.add_clock(sim.clock())
+    simulator.add_testbench(bench)
+    if trace:
+        residency = trace_sim(simulator, fragment, dut._oled)
+    simulator.run()
+    if trace:
+        residency.write(trace)
+
+    return results
+
+
+def add_main_arguments(parser: ArgumentParser):
+    parser.set_defaults(func=main)
+    parser.add_argument(
+        "-s",
+        "--speed",
+        action="append",
+        type=int,
+        choices=OLED.VALID_SPEEDS,
+        help="I2C bus speed to benchmark at (default: all)",
+    )
+    parser.add_argument(
+        "-c",
+        "--command",
+        action="append",
+        choices=[case.name for case in CASES],
+        help="command to benchmark (default: all)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="write results as JSON here (default: stdout)",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PREFIX",
+        help="also write cycles spent in each FSM state, per command, to "
+        "PREFIX-SPEED.json and PREFIX-SPEED.folded",
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="BASELINE",
+        help="compare against a previous run; exits non-zero on a regression",
+    )
+
+
+def main(args: Namespace):
+    speeds = args.speed or OLED.VALID_SPEEDS
+    cases = [case for case in CASES if not args.command or case.name in args.command]
+
+    results: list[dict[str, Any]] = []
+    for speed in speeds:
+        print(f"benchmarking at {Hz(speed)} ...", file=sys.stderr)
+        trace = args.trace and f"{args.trace}-{speed}"
+        results += run(speed, cases, trace=trace)
+
+    report = {
+        "clock": cast(int, Platform["test"].default_clk_frequency),
+        "results": results,
+    }
+    out = json.dumps(report, indent=2) + "\n"
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(out)
+    else:
+        print(out, end="")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        if not compare(baseline, report):
+            sys.exit(1)
+
+
+def compare(baseline: dict[str, Any], report: dict[str, Any]) -> bool:
+    """
+    Print how each result differs from baseline.  Returns False if any
+    command got slower or put more bytes on the bus.
+    """
+    ok = True
+    if baseline["clock"] != report["clock"]:
+        print("baseline was run at a different clock", file=sys.stderr)
+        return False
+
+    before = {(r["command"], r["speed"]): r for r in baseline["results"]}
+    for r in report["results"]:
+        b = before.get((r["command"], r["speed"]))
+        if b is None:
+            continue
+        regressed = r["cycles"] > b["cycles"] or r["bus_bytes"] > b["bus_bytes"]
+        if regressed or r["cycles"] != b["cycles"]:
+            print(
+                f"{'REGRESSED' if regressed else 'changed'}: {r['command']} @ "
+                f"{Hz(r['speed'])}: cycles {b['cycles']} -> {r['cycles']}, "
+                f"bus bytes {b['bus_bytes']} -> {r['bus_bytes']}",
+                file=sys.stderr,
+            )
+        ok = ok and not regressed
+    return ok
@@ -33,6 +33,12 @@ def add_main_arguments(parser: ArgumentParser):
         help="I2C bus speed to build at",
         default=str(OLED.DEFAULT_SPEED),
     )
+    parser.add_argument(
+        "-b",
+        "--baud",
+        type=int,
+        help="UART baud rate, for tops that have one (e.g. sh1107.rtl.bridge.Top)",
+    )
     parser.add_argument(
         "-p",
         "--program",
@@ -78,6 +84,8 @@ def build_top(args: Namespace, platform: Platform, **kwargs: Any) -> Elaboratabl
     sig = inspect.signature(klass)
     if "speed" in sig.parameters and "speed" in args:
         kwargs["speed"] = Hz(args.speed)
+    if "baud" in sig.parameters and getattr(args, "baud", None) is not None:
+        kwargs["baud"] = args.baud
 
     blackboxes = kwargs.pop("blackboxes", Blackboxes())
     if kwargs.get("blackbox_i2c", getattr(args, "blackbox_i2c", False)):
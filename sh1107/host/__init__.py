@@ -0,0 +1,202 @@
+from typing import Any, Self
+
+from ..proto import Cmd, DataBytes
+from ..rtl.bridge import Top as BridgeTop
+from ..rtl.oled import OLED
+
+__all__ = [
+    "Bridge",
+    "encode_cls",
+    "encode_locate",
+    "encode_print",
+    "encode_blit",
+    "encode_fill_rect",
+    "compose_blit",
+    "pack_pages",
+    "decode",
+]
+
+Cm = OLED.Command
+
+# The font is the IBM VGA ROM font, so that's what we encode text as.
+ENCODING = "cp437"
+PRINT_MAX: int = 255
+
+PAGES: int = 16
+COLUMNS: int = 128
+
+
+def encode_cls() -> bytes:
+    return bytes([Cm.CLS])
+
+
+def encode_locate(row: int, col: int) -> bytes:
+    """
+    Rows and columns are 1-based; 0 leaves that coordinate as-is.
+    """
+    assert 0 <= row <= 16 and 0 <= col <= 16
+    return bytes([Cm.LOCATE, row, col])
+
+
+def encode_print(text: str | bytes) -> bytes:
+    """
+    PRINT takes at most PRINT_MAX bytes at a time, so longer text is split
+    over as many PRINTs as it takes.
+    """
+    if isinstance(text, str):
+        text = text.encode(ENCODING)
+    out = b""
+    for i in range(0, len(text), PRINT_MAX):
+        chunk = text[i : i + PRINT_MAX]
+        out += bytes([Cm.PRINT, len(chunk)]) + chunk
+    return out
+
+
+def encode_blit(page: int, col: int, rows: list[bytes]) -> bytes:
+    """
+    Draw a bitmap with its top-left at (page, col); rows has one bytes per
+    page, each byte being 8 pixels of a column, LSB on top.  See pack_pages.
+    """
+    cols = len(rows[0]) if rows else 0
+    _check_rect(page, col, len(rows), cols)
+    assert all(len(row) == cols for row in rows)
+    return bytes([Cm.BLIT, page, col, len(rows), cols]) + b"".join(rows)
+
+
+def encode_fill_rect(
+    page: int, col: int, pages: int, cols: int, pattern: int
+) -> bytes:
+    """
+    Fill pages×cols with pattern, each byte being 8 pixels of a column.
+    """
+    _check_rect(page, col, pages, cols)
+    assert 0 <= pattern <= 0xFF
+    return bytes([Cm.FILL_RECT, page, col, pages, cols, pattern])
+
+
+def _check_rect(page: int, col: int, pages: int, cols: int):
+    assert 0 <= page < PAGES and 0 <= col < COLUMNS
+    assert 0 <= pages <= PAGES - page and 0 <= cols <= COLUMNS - col
+
+
+def compose_blit(page: int, col: int, rows: list[bytes]) -> list[list[int]]:
+    """
+    The SH1107 transactions a BLIT turns into, one per page.
+    """
+    return Cmd.compose(
+        *[
+            [
+                Cmd.SetPageAddress(page + i),
+                Cmd.SetLowerColumnAddress(col & 0x0F),
+                Cmd.SetHigherColumnAddress(col >> 4),
+                DataBytes(list(row)),
+            ]
+            for i, row in enumerate(rows)
+        ]
+    )
+
+
+def pack_pages(pixels: list[list[bool]]) -> list[bytes]:
+    """
+    Pack rows of pixels, a multiple of 8 high, into the page bytes BLIT
+    takes.
+    """
+    assert len(pixels) % 8 == 0
+    rows: list[bytes] = []
+    for top in range(0, len(pixels), 8):
+        band = pixels[top : top + 8]
+        rows.append(
+            bytes(
+                sum(band[bit][x] << bit for bit in range(8))
+                for x in range(len(band[0]))
+            )
+        )
+    return rows
+
+
+def decode(data: bytes) -> list[tuple[OLED.Command, bytes]]:
+    """
+    Split a command stream into (command, arguments) pairs.  A command
+    truncated at the end of data is left off.
+    """
+    result: list[tuple[OLED.Command, bytes]] = []
+    i = 0
+    while i < len(data):
+        cmd = Cm(data[i])
+        match cmd:
+            case Cm.LOCATE:
+                argc = 2
+            case Cm.PRINT:
+                if i + 1 >= len(data):
+                    break
+                argc = 1 + data[i + 1]
+            case Cm.PRINT_BYTE:
+                argc = 1
+            case Cm.BLIT:
+                if i + 4 >= len(data):
+                    break
+                argc = 4 + data[i + 3] * data[i + 4]
+            case Cm.FILL_RECT:
+                argc = 5
+            case _:
+                argc = 0
+        if i + 1 + argc > len(data):
+            break
+        result.append((cmd, data[i + 1 : i + 1 + argc]))
+        i += 1 + argc
+    return result
+
+
+class Bridge:
+    """
+    A serial connection to sh1107.rtl.bridge.Top.
+
+    XON/XOFF is left to the serial driver (or the UART, where it supports it)
+    so we stop sending as soon as possible after the bridge asks us to.
+    """
+
+    DEFAULT_BAUD: int = BridgeTop.DEFAULT_BAUD
+
+    bytes_written: int
+
+    _serial: Any
+
+    def __init__(self, port: str, *, baud: int = DEFAULT_BAUD):
+        import serial
+
+        self._serial = serial.Serial(port, baud, xonxoff=True)
+        self.bytes_written = 0
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: Any):
+        self.close()
+
+    def close(self):
+        self._serial.close()
+
+    def write(self, data: bytes):
+        self._serial.write(data)
+        self.bytes_written += len(data)
+
+    def flush(self):
+        """
+        Wait until everything written has left the host.
+        """
+        self._serial.flush()
+
+    def cls(self):
+        self.write(encode_cls())
+
+    def locate(self, row: int, col: int):
+        self.write(encode_locate(row, col))
+
+    def print(self, text: str | bytes):
+        self.write(encode_print(text))
+
+    def blit(self, page: int, col: int, rows: list[bytes]):
+        self.write(encode_blit(page, col, rows))
+
+    def fill_rect(self, page: int, col: int, pages: int, cols: int, pattern: int):
+        self.write(encode_fill_rect(page, col, pages, cols, pattern))
@@ -0,0 +1,99 @@
+import os
+import select
+import threading
+import time
+from typing import Any, Self
+
+from ..rtl.bridge import Top as BridgeTop
+
+__all__ = ["Loopback"]
+
+
+class Loopback:
+    """
+    Stands in for sh1107.rtl.bridge.Top on a pseudo-terminal, for exercising
+    the host side without a board.
+
+    Open a Bridge on port.  What's written is queued in a FIFO of the
+    bridge's depth, drained at rate bytes per second into received, and
+    flow-controlled with XON/XOFF at the bridge's watermarks.
+    """
+
+    port: str
+    rate: float
+    received: bytearray
+    xoffs: int
+
+    _master: int
+    _slave: int
+    _fifo: bytearray
+    _stopped: bool
+    _lock: threading.Lock
+    _done: threading.Event
+    _thread: threading.Thread
+
+    def __init__(self, *, rate: float = 20_000):
+        self._master, self._slave = os.openpty()
+        self.port = os.ttyname(self._slave)
+        self.rate = rate
+        self.received = bytearray()
+        self.xoffs = 0
+
+        self._fifo = bytearray()
+        self._stopped = False
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: Any):
+        self.close()
+
+    def close(self):
+        self._done.set()
+        self._thread.join()
+        os.close(self._master)
+        os.close(self._slave)
+
+    def wait_for(self, count: int, *, timeout: float = 10.0) -> bytes:
+        """
+        Wait until at least count bytes have been drained, and return them.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if len(self.received) >= count:
+                    return bytes(self.received)
+            time.sleep(0.001)
+        raise TimeoutError(f"only {len(self.received)} of {count} bytes received")
+
+    def _run(self):
+        last = time.monotonic()
+        while not self._done.is_set():
+            # Like the UART, we can't refuse bytes once they're on the wire,
+            # but here we can at least leave them in the pty until there's
+            # room for them.
+            room = BridgeTop.FIFO_DEPTH - len(self._fifo)
+            if room and select.select([self._master], [], [], 0.001)[0]:
+                self._fifo += os.read(self._master, room)
+            elif not room:
+                time.sleep(0.001)
+
+            now = time.monotonic()
+            drain = int((now - last) * self.rate)
+            if drain:
+                last = now
+                with self._lock:
+                    self.received += self._fifo[:drain]
+                del self._fifo[:drain]
+
+            if not self._stopped and len(self._fifo) >= BridgeTop.HIGH_WATER:
+                os.write(self._master, bytes([BridgeTop.XOFF]))
+                self._stopped = True
+                self.xoffs += 1
+            elif self._stopped and len(self._fifo) <= BridgeTop.LOW_WATER:
+                os.write(self._master, bytes([BridgeTop.XON]))
+                self._stopped = False
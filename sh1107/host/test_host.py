@@ -0,0 +1,75 @@
+import unittest
+
+from ..rtl.oled import OLED
+from . import (Bridge, decode, encode_blit, encode_cls, encode_fill_rect,
+               encode_locate, encode_print, pack_pages)
+from .loopback import Loopback
+
+Cm = OLED.Command
+
+
+class TestEncode(unittest.TestCase):
+    def test_commands(self):
+        self.assertEqual(bytes([0x04]), encode_cls())
+        self.assertEqual(bytes([0x05, 0x02, 0x10]), encode_locate(2, 16))
+        self.assertEqual(bytes([0x06, 0x03, 0x48, 0x69, 0x0A]), encode_print("Hi\n"))
+
+    def test_print_splits(self):
+        data = encode_print("x" * 300)
+        self.assertEqual([255, 45], [len(args) - 1 for _, args in decode(data)])
+        self.assertEqual(255 + 45 + 4, len(data))
+
+    def test_decode_roundtrip(self):
+        data = encode_cls() + encode_locate(3, 4) + encode_print("über")
+        self.assertEqual(
+            [
+                (Cm.CLS, b""),
+                (Cm.LOCATE, bytes([3, 4])),
+                (Cm.PRINT, bytes([4]) + "über".encode("cp437")),
+            ],
+            decode(data),
+        )
+
+    def test_blit(self):
+        rows = [b"\x01\x02\x03", b"\x04\x05\x06"]
+        data = encode_blit(2, 100, rows) + encode_fill_rect(0, 0, 16, 128, 0xFF)
+        self.assertEqual(
+            [
+                (Cm.BLIT, bytes([2, 100, 2, 3, 1, 2, 3, 4, 5, 6])),
+                (Cm.FILL_RECT, bytes([0, 0, 16, 128, 0xFF])),
+            ],
+            decode(data),
+        )
+        self.assertEqual([], decode(encode_blit(0, 0, rows)[:-1]))
+
+    def test_pack_pages(self):
+        # A diagonal line, top-left to bottom-right, over two pages.
+        pixels = [[x == y for x in range(16)] for y in range(16)]
+        self.assertEqual(
+            [
+                bytes([1 << i for i in range(8)] + [0] * 8),
+                bytes([0] * 8 + [1 << i for i in range(8)]),
+            ],
+            pack_pages(pixels),
+        )
+
+    def test_decode_truncated(self):
+        data = encode_cls() + encode_print("abc")
+        self.assertEqual([(Cm.CLS, b"")], decode(data[:-1]))
+
+
+class TestLoopback(unittest.TestCase):
+    def test_flow_control(self):
+        with Loopback(rate=50_000) as loopback:
+            with Bridge(loopback.port) as bridge:
+                bridge.cls()
+                for i in range(20):
+                    bridge.locate(i % 16 + 1, 1)
+                    bridge.print(f"line {i:02}\n" * 8)
+                bridge.flush()
+                received = loopback.wait_for(bridge.bytes_written)
+
+            commands = decode(received)
+            self.assertEqual(41, len(commands))
+            self.assertEqual((Cm.PRINT, bytes([64]) + b"line 19\n" * 8), commands[-1])
+            self.assertGreater(loopback.xoffs, 0)
@@ -46,6 +46,10 @@ class Platform(metaclass=PlatformRegistry):
 
     simulation = False
 
+    # Whether the OLED's ROM memory starts out holding the ROM, rather than
+    # being copied in from SPI flash at reset.  Simulation only.
+    preload_rom = False
+
 
 class icebreaker(ICEBreakerPlatform, Platform):
     @property
@@ -75,6 +79,8 @@ class vsh(Platform):
     def flash_rom_base(self) -> int:
         return 0xAB_CDEF
 
+    preload_rom = True
+
     @property
     def default_clk_frequency(self):
         # XXX We can't compile `vsh -i' with this, but the timer is ~accurate for me.
@@ -88,6 +94,7 @@ class test(Platform):
         return 0x00_CAFE
 
     simulation = True
+    preload_rom = True
 
     @property
     def default_clk_frequency(self):
@@ -0,0 +1,341 @@
+import mmap
+import re
+import warnings
+from typing import Iterator, NamedTuple, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from . import Cmd
+from .model import SH1107
+
+__all__ = [
+    "Transaction",
+    "vcd_transactions",
+    "replay",
+]
+
+# How much of the capture is decoded at once.  Each byte of it costs a few
+# dozen bytes of scratch arrays.
+CHUNK: int = 16 * 1024 * 1024
+
+# Event codes, as decoded from the bus: a bit's value, or one of these.
+_START = 2
+_STOP = 3
+
+_WHITESPACE = np.zeros(256, dtype=np.bool_)
+_WHITESPACE[list(b" \t\r\n")] = True
+
+_TIMESCALE = re.compile(rb"\$timescale\s+(\d+)\s*([munpf]?s)\s+\$end")
+_UNITS = {b"s": 1, b"ms": 1e-3, b"us": 1e-6, b"ns": 1e-9, b"ps": 1e-12, b"fs": 1e-15}
+
+
+class Transaction(NamedTuple):
+    time: float  # Seconds into the capture, as of its STOP/repeated START.
+    addr: int
+    rw: int
+    data: list[int]  # Only the bytes that were ACKed.
+
+
+class _Header(NamedTuple):
+    scl: bytes
+    sda: bytes
+    timescale: float
+    body: int
+
+
+def _header(mm: mmap.mmap, scl: str, sda: str) -> _Header:
+    end = mm.find(b"$enddefinitions")
+    assert end >= 0, "no $enddefinitions in VCD"
+    body = mm.find(b"$end", end + len(b"$enddefinitions")) + len(b"$end")
+    header = mm[:end]
+
+    timescale = 1e-9
+    if (match := _TIMESCALE.search(header)) is not None:
+        timescale = int(match[1]) * _UNITS[match[2]]
+
+    scope: list[str] = []
+    idents: dict[str, bytes] = {}
+    tokens = iter(header.split())
+    for token in tokens:
+        if token == b"$scope":
+            next(tokens)
+            scope.append(next(tokens).decode())
+        elif token == b"$upscope":
+            scope.pop()
+        elif token == b"$var":
+            next(tokens)
+            width = next(tokens)
+            ident = next(tokens)
+            name = next(tokens).decode()
+            if width != b"1":
+                continue
+            for wanted in (scl, sda):
+                if wanted in idents:
+                    continue
+                full = ".".join(scope + [name])
+                if wanted.lower() in (name.lower(), full.lower()):
+                    idents[wanted] = ident
+
+    assert scl in idents, f"no 1-bit {scl!r} in VCD"
+    assert sda in idents, f"no 1-bit {sda!r} in VCD"
+    return _Header(idents[scl], idents[sda], timescale, body)
+
+
+def _tokens(
+    buf: npt.NDArray[np.uint8],
+) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    # buf starts and ends on whitespace, so every token's start has a matching
+    # end.
+    edges = np.diff(_WHITESPACE[buf].view(np.int8))
+    return np.flatnonzero(edges == -1) + 1, np.flatnonzero(edges == 1) + 1
+
+
+def _is_ident(
+    buf: npt.NDArray[np.uint8],
+    starts: npt.NDArray[np.intp],
+    lengths: npt.NDArray[np.intp],
+    ident: bytes,
+) -> npt.NDArray[np.bool_]:
+    found = lengths == len(ident) + 1
+    candidates = starts[found]
+    match = np.ones(len(candidates), dtype=np.bool_)
+    for i, b in enumerate(ident):
+        match &= buf[candidates + 1 + i] == b
+    found[found] = match
+    return found
+
+
+def _times(
+    buf: npt.NDArray[np.uint8],
+    starts: npt.NDArray[np.intp],
+    lengths: npt.NDArray[np.intp],
+) -> npt.NDArray[np.int64]:
+    digits = lengths - 1
+    times = np.zeros(len(starts), dtype=np.int64)
+    for i in range(int(digits.max(initial=0))):
+        more = digits > i
+        times[more] = times[more] * 10 + (buf[starts[more] + 1 + i] - ord("0"))
+    return times
+
+
+class _Decoder:
+    """
+    Turns a VCD body, a chunk at a time, into transactions, carrying the
+    line levels and any unfinished transaction from one chunk to the next.
+    """
+
+    scl_id: bytes
+    sda_id: bytes
+    timescale: float
+
+    _time: int
+    _scl: int
+    _sda: int
+    _codes: npt.NDArray[np.uint8]
+    _code_times: npt.NDArray[np.int64]
+
+    def __init__(self, header: _Header):
+        self.scl_id = header.scl
+        self.sda_id = header.sda
+        self.timescale = header.timescale
+
+        # Both lines idle high.
+        self._time = 0
+        self._scl = 1
+        self._sda = 1
+        self._codes = np.zeros(0, dtype=np.uint8)
+        self._code_times = np.zeros(0, dtype=np.int64)
+
+    def feed(self, buf: npt.NDArray[np.uint8]) -> list[Transaction]:
+        starts, ends = _tokens(buf)
+        lengths = ends - starts
+        first = buf[starts]
+
+        is_time = first == ord("#")
+        is_scl = _is_ident(buf, starts, lengths, self.scl_id)
+        is_sda = _is_ident(buf, starts, lengths, self.sda_id)
+        # x is as good as no change; an undriven line is pulled up.
+        known = (first != ord("x")) & (first != ord("X"))
+        is_scl &= known
+        is_sda &= known
+        value = (first != ord("0")).astype(np.int8)
+
+        # Each change happens at the time last given before it.
+        time_at = np.flatnonzero(is_time)
+        times = np.concatenate(
+            ([self._time], _times(buf, starts[time_at], lengths[time_at]))
+        )
+        changes = np.flatnonzero(is_scl | is_sda)
+        change_times = times[np.searchsorted(time_at, changes)]
+        self._time = int(times[-1])
+
+        line_scl = is_scl[changes]
+        value = value[changes]
+        scl = self._fill(line_scl, value, self._scl)
+        sda = self._fill(~line_scl, value, self._sda)
+        prev_scl = np.concatenate(([self._scl], scl[:-1]))
+        prev_sda = np.concatenate(([self._sda], sda[:-1]))
+        if len(changes):
+            self._scl = int(scl[-1])
+            self._sda = int(sda[-1])
+
+        # A change only ever moves one line, so the other's level is the same
+        # before and after it.
+        rising = line_scl & (scl == 1) & (prev_scl == 0)
+        start = ~line_scl & (scl == 1) & (sda == 0) & (prev_sda == 1)
+        stop = ~line_scl & (scl == 1) & (sda == 1) & (prev_sda == 0)
+        events = rising | start | stop
+        codes = np.where(start, _START, np.where(stop, _STOP, sda))[events]
+
+        self._codes = np.concatenate((self._codes, codes.astype(np.uint8)))
+        self._code_times = np.concatenate((self._code_times, change_times[events]))
+        return self._transactions(final=False)
+
+    def finish(self) -> list[Transaction]:
+        return self._transactions(final=True)
+
+    @staticmethod
+    def _fill(
+        mask: npt.NDArray[np.bool_], value: npt.NDArray[np.int8], initial: int
+    ) -> npt.NDArray[np.int8]:
+        # The level after each change: the last value given for this line.
+        at = np.where(mask, np.arange(len(mask)), -1)
+        np.maximum.accumulate(at, out=at)
+        return np.where(at >= 0, value[at], initial).astype(np.int8)
+
+    def _transactions(self, *, final: bool) -> list[Transaction]:
+        codes, code_times = self._codes, self._code_times
+        bounds = np.flatnonzero(codes >= _START)
+        if len(bounds) == 0:
+            # What's kept always starts at a boundary, so these are bits from
+            # before the capture's first START.
+            self._codes, self._code_times = codes[:0], code_times[:0]
+            return []
+
+        # Bits after the last START are a transaction still being sent; keep
+        # them for the next chunk, unless there won't be one.
+        end = len(codes) if final else int(bounds[-1])
+        done = codes[:end]
+        self._codes, self._code_times = codes[end:], code_times[end:]
+
+        # Bits before the first boundary (only ever at the very start of the
+        # capture) are in segment -1.
+        segment = np.cumsum(done >= _START) - 1
+        bits = np.flatnonzero(done < _START)
+        if len(bits) == 0:
+            return []
+        bit_segment = segment[bits]
+        first_bit = np.flatnonzero(np.diff(bit_segment, prepend=-2))
+        bit_in_segment = np.arange(len(bits)) - np.repeat(
+            first_bit, np.diff(first_bit, append=len(bits))
+        )
+        position = bit_in_segment % 9
+        byte = np.cumsum(position == 0) - 1
+
+        data = position < 8
+        values = np.bincount(
+            byte[data],
+            weights=done[bits[data]].astype(np.int64) << (7 - position[data]),
+            minlength=byte[-1] + 1,
+        ).astype(np.int64)
+        acks = np.ones(byte[-1] + 1, dtype=np.int8)
+        acks[byte[~data]] = done[bits[~data]]
+        complete = np.zeros(byte[-1] + 1, dtype=np.bool_)
+        complete[byte[~data]] = True
+        byte_segment = bit_segment[position == 0]
+
+        # Each segment ends at the next boundary, or wherever the capture did.
+        seg_ends = np.append(bounds[1:], len(codes) - 1)
+
+        transactions: list[Transaction] = []
+        byte_bounds = np.flatnonzero(np.diff(byte_segment, prepend=-2))
+        byte_ends = np.append(byte_bounds[1:], len(byte_segment))
+        for lo, hi in zip(byte_bounds, byte_ends):
+            seg = int(byte_segment[lo])
+            if seg < 0 or codes[bounds[seg]] != _START:
+                # Bits after a STOP aren't addressed to anyone.
+                continue
+            if not complete[lo] or acks[lo]:
+                continue
+            addr = int(values[lo])
+            accepted = complete[lo + 1 : hi] & (acks[lo + 1 : hi] == 0)
+            # Nothing after the first NACK counts.
+            count = int(np.argmin(accepted)) if not accepted.all() else len(accepted)
+            transactions.append(
+                Transaction(
+                    time=float(code_times[seg_ends[seg]]) * self.timescale,
+                    addr=addr >> 1,
+                    rw=addr & 1,
+                    data=values[lo + 1 : lo + 1 + count].tolist(),
+                )
+            )
+        return transactions
+
+
+def vcd_transactions(
+    path: str, *, scl: str = "scl", sda: str = "sda", chunk: int = CHUNK
+) -> Iterator[Transaction]:
+    """
+    Decode the I²C transactions in a VCD capture of the bus, e.g. as exported
+    from a logic analyser by sigrok.  scl and sda name the 1-bit signals to
+    use, either as-is or with their scopes.
+
+    The capture's mapped, not read, and decoded chunk by chunk with NumPy, so
+    its size isn't limited by memory.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header = _header(mm, scl, sda)
+        decoder = _Decoder(header)
+
+        pos = header.body
+        while pos < len(mm):
+            end = min(pos + chunk, len(mm))
+            # Don't split a token.
+            while end < len(mm) and mm[end] not in b" \t\r\n":
+                end += 1
+            buf = np.frombuffer(mm, dtype=np.uint8, count=end - pos, offset=pos)
+            # Padded with whitespace, so the edges are tokens' edges.
+            padded = np.concatenate(([0x20], buf, [0x20]))
+            del buf
+            yield from decoder.feed(padded)
+            pos = end
+        yield from decoder.finish()
+
+
+def replay(
+    transactions: Iterator[Transaction],
+    *,
+    addr: int,
+    interval: float = 0.0,
+) -> Iterator[tuple[float, npt.NDArray[np.bool_]]]:
+    """
+    Apply writes to addr to an SH1107 model, yielding (time, image) whenever
+    what's displayed changes, at most once per interval seconds of capture.
+    Whatever's displayed at the end is always yielded, if it isn't already.
+    """
+    sh1107 = SH1107()
+    shown = sh1107.image()
+    shown_at: Optional[float] = None
+    pending: Optional[float] = None
+    for transaction in transactions:
+        if transaction.addr != addr or transaction.rw != 0:
+            continue
+
+        parser = Cmd.Parser()
+        sh1107.feed(parser.feed(transaction.data))
+        if parser.unrecoverable:
+            warnings.warn(
+                f"{transaction.time:.6f}: unparseable: {transaction.data!r}"
+            )
+
+        if shown_at is not None and transaction.time - shown_at < interval:
+            pending = transaction.time
+            continue
+        image = sh1107.image()
+        if not np.array_equal(image, shown):
+            shown, shown_at, pending = image, transaction.time, None
+            yield shown_at, shown
+
+    if pending is not None and not np.array_equal(image := sh1107.image(), shown):
+        yield pending, image
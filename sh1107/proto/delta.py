@@ -0,0 +1,83 @@
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+from . import Base, Cmd, DataBytes
+
+__all__ = ["PAGES", "COLUMNS", "Run", "diff_runs", "delta_transactions"]
+
+PAGES = 16
+COLUMNS = 128
+
+# Bus bytes it costs to start a transaction and address a run within the
+# page the last one was in: the address byte, a continued control byte and
+# SetLowerColumnAddress, and the data control byte.  Moving the higher
+# column nibble costs another two.
+_RUN_COST = 4
+_HIGHER_COST = 2
+
+Frame = npt.NDArray[np.uint8]
+
+
+class Run(NamedTuple):
+    page: int
+    start: int
+    end: int  # Exclusive.
+
+
+def diff_runs(old: Frame, new: Frame) -> list[Run]:
+    """
+    Find the column runs that need rewriting to turn old into new, both
+    PAGES×COLUMNS arrays of display RAM bytes.
+
+    Runs in the same page are merged wherever resending the unchanged bytes
+    between them is cheaper than addressing the second run separately.
+    """
+    assert old.shape == new.shape == (PAGES, COLUMNS)
+
+    changed = np.zeros((PAGES, COLUMNS + 2), dtype=np.int8)
+    changed[:, 1:-1] = old != new
+    edges = np.diff(changed, axis=1)
+    pages, starts = np.nonzero(edges == 1)
+    ends = np.nonzero(edges == -1)[1]
+    if len(pages) == 0:
+        return []
+
+    # nonzero returns row-major order, so starts and ends pair up run by run.
+    gap = starts[1:] - ends[:-1]
+    cost = _RUN_COST + _HIGHER_COST * ((starts[1:] >> 4) != (ends[:-1] >> 4))
+    merge = (pages[1:] == pages[:-1]) & (gap <= cost)
+
+    first = np.concatenate(([True], ~merge))
+    last = np.concatenate((~merge, [True]))
+    return [
+        Run(int(page), int(start), int(end))
+        for page, start, end in zip(pages[first], starts[first], ends[last])
+    ]
+
+
+def delta_transactions(old: Frame, new: Frame) -> list[list[int]]:
+    """
+    The SH1107 transactions (in page addressing mode) that turn old into new.
+    Each run is one transaction, and only sets what addresses it needs to:
+    the page and column left by the previous run are reused where they match.
+    """
+    seqs: list[list[Base | DataBytes]] = []
+    page = col = None
+    for run in diff_runs(old, new):
+        seq: list[Base | DataBytes] = []
+        if run.page != page:
+            seq.append(Cmd.SetPageAddress(run.page))
+        if col is None or run.start & 0x0F != col & 0x0F:
+            seq.append(Cmd.SetLowerColumnAddress(run.start & 0x0F))
+        if col is None or run.start >> 4 != col >> 4:
+            seq.append(Cmd.SetHigherColumnAddress(run.start >> 4))
+        seq.append(DataBytes(new[run.page, run.start : run.end].tolist()))
+        seqs.append(seq)
+
+        page = run.page
+        # Where the column lands after the last column isn't something we
+        # want to rely on.
+        col = run.end if run.end < COLUMNS else None
+    return Cmd.compose(*seqs)
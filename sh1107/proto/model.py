@@ -0,0 +1,165 @@
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from . import Base, Cmd, DataBytes
+
+__all__ = ["SH1107"]
+
+PAGES = 16
+COLUMNS = 128
+WIDTH = 128
+HEIGHT = 128
+
+
+class SH1107:
+    """
+    The display's state, as sh1107.vsh models it, with its RAM as a
+    PAGES×COLUMNS array of page bytes.  image() renders it the way vsh draws
+    it.
+
+    Data writes are applied as array slices, so replaying a whole session is
+    quick: what matters is the number of transactions, not their length.
+    """
+
+    power: bool
+    dcdc: bool
+    contrast: int
+    all_on: bool
+    reversed: bool
+    start_line: int
+    start_offset: int
+    multiplex: int
+    page_address: int
+    column_address: int
+    addressing_mode: Cmd.SetMemoryAddressingMode.Mode
+    segment_remap: Cmd.SetSegmentRemap.Adc
+    com_scan_dir: Cmd.SetCommonOutputScanDirection.Direction
+
+    ram: npt.NDArray[np.uint8]
+
+    _rmw_column: Optional[int]
+
+    def __init__(self):
+        self.power = False
+        self.dcdc = True
+        self.contrast = 0x80
+        self.all_on = False
+        self.reversed = False
+        self.start_line = 0
+        self.start_offset = 0
+        self.multiplex = 128
+        self.page_address = 0
+        self.column_address = 0
+        self.addressing_mode = Cmd.SetMemoryAddressingMode.Mode.Page
+        self.segment_remap = Cmd.SetSegmentRemap.Adc.Normal
+        self.com_scan_dir = Cmd.SetCommonOutputScanDirection.Direction.Forwards
+
+        self.ram = np.zeros((PAGES, COLUMNS), dtype=np.uint8)
+
+        self._rmw_column = None
+
+    def write(self, transaction: list[int]):
+        """
+        Apply one write transaction's bytes (after the address).
+        """
+        parser = Cmd.Parser()
+        self.feed(parser.feed(transaction))
+        assert not parser.unrecoverable, f"unparseable: {transaction!r}"
+
+    def feed(self, cmds: list[Base | DataBytes]):
+        for cmd in cmds:
+            if isinstance(cmd, DataBytes):
+                self.data(cmd.data)
+            else:
+                self.cmd(cmd)
+
+    def cmd(self, cmd: Base):
+        match cmd:
+            case Cmd.SetLowerColumnAddress(lower=lower):
+                self.column_address = (self.column_address & 0x70) | lower
+            case Cmd.SetHigherColumnAddress(higher=higher):
+                self.column_address = (self.column_address & 0x0F) | (higher << 4)
+            case Cmd.SetMemoryAddressingMode(mode=mode):
+                self.addressing_mode = mode
+            case Cmd.SetContrastControlRegister(level=level):
+                self.contrast = level
+            case Cmd.SetSegmentRemap(adc=adc):
+                self.segment_remap = adc
+            case Cmd.SetMultiplexRatio(ratio=ratio):
+                self.multiplex = ratio
+            case Cmd.SetEntireDisplayOn(on=on):
+                self.all_on = on
+            case Cmd.SetDisplayReverse(reverse=reverse):
+                self.reversed = reverse
+            case Cmd.SetDisplayOffset(offset=offset):
+                self.start_offset = offset
+            case Cmd.SetDCDC(on=on):
+                self.dcdc = on
+            case Cmd.DisplayOn(on=on):
+                self.power = on
+            case Cmd.SetPageAddress(page=page):
+                self.page_address = page
+            case Cmd.SetCommonOutputScanDirection(direction=direction):
+                self.com_scan_dir = direction
+            case Cmd.SetDisplayStartLine(column=column):
+                self.start_line = column
+            case Cmd.ReadModifyWrite():
+                self._rmw_column = self.column_address
+            case Cmd.End():
+                if self._rmw_column is not None:
+                    self.column_address = self._rmw_column
+                    self._rmw_column = None
+            case _:
+                # Timing and power settings don't change what's shown.
+                pass
+
+    def data(self, data: list[int] | bytes):
+        if not data:
+            return
+        values = np.asarray(data, dtype=np.uint8)
+        match self.addressing_mode:
+            case Cmd.SetMemoryAddressingMode.Mode.Page:
+                count, address = COLUMNS, self.column_address
+            case Cmd.SetMemoryAddressingMode.Mode.Vertical:
+                count, address = PAGES, self.page_address
+
+        # Anything more than a lap's worth just overwrites itself; keep the
+        # last lap so the indices below are unique.
+        start = address + max(0, len(values) - count)
+        values = values[-count:]
+        indices = (start + np.arange(len(values))) % count
+        match self.addressing_mode:
+            case Cmd.SetMemoryAddressingMode.Mode.Page:
+                self.ram[self.page_address, indices] = values
+                self.column_address = (address + len(data)) % COLUMNS
+            case Cmd.SetMemoryAddressingMode.Mode.Vertical:
+                self.ram[indices, self.column_address] = values
+                self.page_address = (address + len(data)) % PAGES
+
+    def image(self) -> npt.NDArray[np.bool_]:
+        """
+        What's on the display, HEIGHT×WIDTH, True where lit.
+        """
+        if not self.power:
+            return np.zeros((HEIGHT, WIDTH), dtype=np.bool_)
+        if self.all_on:
+            return np.ones((HEIGHT, WIDTH), dtype=np.bool_)
+
+        # One row per bit of each page, LSB first; the column is the other
+        # axis.
+        pixels = np.unpackbits(self.ram, axis=0, bitorder="little").astype(np.bool_)
+        if self.segment_remap == Cmd.SetSegmentRemap.Adc.Flipped:
+            pixels = pixels[::-1]
+
+        # The panel's mounted rotated: RAM rows run right to left, and columns
+        # top to bottom, starting from the start line.
+        pixels = pixels[::-1].T
+        pixels = np.roll(pixels, -((self.start_line + self.start_offset) % 128), 0)
+        if self.com_scan_dir == Cmd.SetCommonOutputScanDirection.Direction.Backwards:
+            pixels = pixels[::-1]
+
+        if self.reversed:
+            pixels = ~pixels
+        return pixels
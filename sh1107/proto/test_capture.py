@@ -0,0 +1,128 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from .. import rom
+from ..rom.chars import CHARS
+from . import Cmd, DataBytes
+from .capture import Transaction, replay, vcd_transactions
+from .model import SH1107
+
+# Bus level changes, one half-bit apart: (scl, sda), either None if unchanged.
+_Change = tuple[int | None, int | None]
+
+
+def _transaction(addr: int, data: list[int], *, nack_at: int = -1) -> list[_Change]:
+    changes: list[_Change] = [(None, 0)]
+    for i, byte in enumerate([addr << 1, *data]):
+        for bit in range(7, -1, -1):
+            changes += [(0, None), (None, (byte >> bit) & 1), (1, None)]
+        changes += [(0, None), (None, int(i == nack_at)), (1, None)]
+    changes += [(0, None), (None, 0), (1, None), (None, 1)]
+    return changes
+
+
+def _vcd(changes: list[_Change], *, sigrok: bool) -> str:
+    # sigrok puts changes on the same line as their time; Amaranth doesn't.
+    sep = " " if sigrok else "\n"
+    lines = [
+        "$timescale 1 us $end",
+        "$scope module top $end",
+        "$var wire 1 ! SCL $end",
+        "$var wire 1 # other $end",
+        '$var wire 1 " SDA $end',
+        "$upscope $end",
+        "$enddefinitions $end",
+        "#0" + sep + "1!" + sep + '1"' + sep + "x#",
+    ]
+    for t, (scl, sda) in enumerate(changes, 1):
+        line = [f"#{t * 10}"]
+        if scl is not None:
+            line.append(f"{scl}!")
+        if sda is not None:
+            line.append(f'{sda}"')
+        # Something else changing, which mustn't be mistaken for the bus.
+        line.append("0#" if t % 2 else "1#")
+        lines.append(sep.join(line))
+    return "\n".join(lines) + "\n"
+
+
+class TestCapture(unittest.TestCase):
+    def _decode(self, changes: list[_Change], **kwargs) -> list[Transaction]:
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "capture.vcd")
+            with open(path, "w") as f:
+                f.write(_vcd(changes, sigrok=kwargs.pop("sigrok", True)))
+            return list(vcd_transactions(path, scl="SCL", sda="top.SDA", **kwargs))
+
+    def test_decode(self):
+        changes = _transaction(0x3C, [0x00, 0xAF]) + _transaction(0x3D, [0x40, 0x12])
+        for sigrok in [True, False]:
+            for chunk in [7, 64, 1 << 20]:
+                with self.subTest(sigrok=sigrok, chunk=chunk):
+                    transactions = self._decode(changes, sigrok=sigrok, chunk=chunk)
+                    self.assertEqual(
+                        [
+                            (0x3C, 0, [0x00, 0xAF]),
+                            (0x3D, 0, [0x40, 0x12]),
+                        ],
+                        [(t.addr, t.rw, t.data) for t in transactions],
+                    )
+                    # Each at its STOP, in microseconds.
+                    self.assertAlmostEqual(
+                        len(_transaction(0x3C, [0, 0])) * 10e-6, transactions[0].time
+                    )
+
+    def test_decode_nack(self):
+        transactions = self._decode(
+            _transaction(0x3C, [0x40, 0x01, 0x02, 0x03], nack_at=2)
+            + _transaction(0x3C, [0x00, 0xAF], nack_at=0)
+        )
+        # The NACKed address isn't a transaction at all.
+        self.assertEqual([(0x3C, [0x40])], [(t.addr, t.data) for t in transactions])
+
+    def test_replay(self):
+        writes = [
+            *rom.INIT_SEQUENCE,
+            *rom.DISPLAY_ON_SEQUENCE,
+            *Cmd.compose(
+                [
+                    Cmd.SetPageAddress(15),
+                    Cmd.SetLowerColumnAddress(0),
+                    Cmd.SetHigherColumnAddress(0),
+                    DataBytes(list(CHARS[ord("A")])),
+                ],
+                [DataBytes(list(CHARS[ord("B")]))],
+                [DataBytes(list(CHARS[ord("C")]))],
+            ),
+        ]
+        changes = [c for w in writes for c in _transaction(0x3C, w)]
+        # Not for the display.
+        changes += _transaction(0x3D, [0x00, 0xA7])
+
+        expected = SH1107()
+        images = []
+        for w in writes:
+            expected.write(w)
+            images.append(expected.image())
+
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "capture.vcd")
+            with open(path, "w") as f:
+                f.write(_vcd(changes, sigrok=True))
+            transactions = vcd_transactions(path, scl="scl", sda="sda")
+            frames = list(replay(transactions, addr=0x3C))
+            # Turning it on doesn't show anything until there's something in
+            # RAM; then one frame per glyph.
+            self.assertEqual(3, len(frames))
+            for image, (_, frame) in zip(images[-3:], frames):
+                np.testing.assert_array_equal(image, frame)
+            self.assertLess(frames[0][0], frames[1][0])
+
+            # B's too soon after A, but the end's never left out.
+            frames = list(replay(vcd_transactions(path), addr=0x3C, interval=1.0))
+            self.assertEqual(2, len(frames))
+            np.testing.assert_array_equal(images[-3], frames[0][1])
+            np.testing.assert_array_equal(images[-1], frames[1][1])
@@ -0,0 +1,71 @@
+import unittest
+
+import numpy as np
+
+from . import Cmd, DataBytes
+from .delta import COLUMNS, PAGES, Run, delta_transactions, diff_runs
+
+
+def _blank() -> np.ndarray:
+    return np.zeros((PAGES, COLUMNS), dtype=np.uint8)
+
+
+class TestDelta(unittest.TestCase):
+    def test_unchanged(self):
+        frame = np.arange(PAGES * COLUMNS, dtype=np.uint8).reshape(PAGES, COLUMNS)
+        self.assertEqual([], diff_runs(frame, frame.copy()))
+        self.assertEqual([], delta_transactions(frame, frame.copy()))
+
+    def test_runs(self):
+        new = _blank()
+        new[2, 10:13] = 0xFF
+        # Close enough to the first to be worth resending the gap.
+        new[2, 16] = 0x01
+        # Too far.
+        new[2, 40:42] = 0x80
+        # Touching the end, and the start of the next page.
+        new[3, 127] = 0x01
+        new[4, 0] = 0x01
+        self.assertEqual(
+            [
+                Run(2, 10, 17),
+                Run(2, 40, 42),
+                Run(3, 127, 128),
+                Run(4, 0, 1),
+            ],
+            diff_runs(_blank(), new),
+        )
+
+    def test_full_frame(self):
+        new = np.full((PAGES, COLUMNS), 0xAA, dtype=np.uint8)
+        self.assertEqual(
+            [Run(page, 0, COLUMNS) for page in range(PAGES)],
+            diff_runs(_blank(), new),
+        )
+
+    def test_transactions(self):
+        new = _blank()
+        new[5, 0x20:0x22] = [1, 2]
+        new[5, 0x30] = 3
+        new[6, 0x31] = 4
+        self.assertEqual(
+            Cmd.compose(
+                [
+                    Cmd.SetPageAddress(5),
+                    Cmd.SetLowerColumnAddress(0x0),
+                    Cmd.SetHigherColumnAddress(0x2),
+                    DataBytes([1, 2]),
+                ],
+                [
+                    Cmd.SetLowerColumnAddress(0x0),
+                    Cmd.SetHigherColumnAddress(0x3),
+                    DataBytes([3]),
+                ],
+                # The column's already where we want it.
+                [
+                    Cmd.SetPageAddress(6),
+                    DataBytes([4]),
+                ],
+            ),
+            delta_transactions(_blank(), new),
+        )
@@ -0,0 +1,107 @@
+import unittest
+
+import numpy as np
+
+from .. import rom
+from ..rom.chars import CHARS
+from . import Cmd, DataBytes
+from .model import SH1107
+
+
+def _glyph(c: str) -> np.ndarray:
+    rows = np.array(list(CHARS[ord(c)]), dtype=np.uint8)
+    return np.unpackbits(rows[:, None], axis=1)
+
+
+class TestSH1107Model(unittest.TestCase):
+    def _init(self) -> SH1107:
+        sh1107 = SH1107()
+        for transaction in rom.INIT_SEQUENCE + rom.DISPLAY_ON_SEQUENCE:
+            sh1107.write(transaction)
+        return sh1107
+
+    def _print(self, sh1107: SH1107, page: int, col: int, c: str):
+        (transaction,) = Cmd.compose(
+            [
+                Cmd.SetPageAddress(page),
+                Cmd.SetLowerColumnAddress(col & 0x0F),
+                Cmd.SetHigherColumnAddress(col >> 4),
+                DataBytes(list(CHARS[ord(c)])),
+            ]
+        )
+        sh1107.write(transaction)
+
+    def test_page_addressing(self):
+        sh1107 = SH1107()
+        sh1107.cmd(Cmd.SetPageAddress(3))
+        sh1107.cmd(Cmd.SetLowerColumnAddress(0xE))
+        sh1107.cmd(Cmd.SetHigherColumnAddress(0x7))
+        sh1107.data([1, 2, 3, 4])
+        self.assertEqual([1, 2], sh1107.ram[3, 126:].tolist())
+        self.assertEqual([3, 4], sh1107.ram[3, :2].tolist())
+        self.assertEqual((3, 2), (sh1107.page_address, sh1107.column_address))
+
+        # More than a lap: only the last one sticks.
+        sh1107.data(list(range(130)))
+        self.assertEqual(
+            list(range(2, 130)),
+            sh1107.ram[3, 4:].tolist() + sh1107.ram[3, :4].tolist(),
+        )
+        self.assertEqual(4, sh1107.column_address)
+
+    def test_vertical_addressing(self):
+        sh1107 = SH1107()
+        sh1107.feed(
+            [
+                Cmd.SetMemoryAddressingMode("Vertical"),
+                Cmd.SetPageAddress(15),
+                Cmd.SetLowerColumnAddress(5),
+                DataBytes([0xAA, 0xBB]),
+            ]
+        )
+        self.assertEqual(0xAA, sh1107.ram[15, 5])
+        self.assertEqual(0xBB, sh1107.ram[0, 5])
+        self.assertEqual((1, 5), (sh1107.page_address, sh1107.column_address))
+
+    def test_glyphs(self):
+        # LOCATE 1,1 is page 15, column 0; LOCATE 2,3 is page 13, column 8.
+        sh1107 = self._init()
+        self._print(sh1107, 15, 0, "A")
+        self._print(sh1107, 13, 8, "g")
+
+        image = sh1107.image()
+        np.testing.assert_array_equal(_glyph("A"), image[0:8, 0:8])
+        np.testing.assert_array_equal(_glyph("g"), image[8:16, 16:24])
+        self.assertEqual(_glyph("A").sum() + _glyph("g").sum(), image.sum())
+
+    def test_start_line(self):
+        sh1107 = self._init()
+        self._print(sh1107, 15, 8, "A")
+        sh1107.cmd(Cmd.SetDisplayStartLine(8))
+        np.testing.assert_array_equal(_glyph("A"), sh1107.image()[0:8, 0:8])
+
+        # Wrapped around to the bottom.
+        sh1107.cmd(Cmd.SetDisplayStartLine(12))
+        np.testing.assert_array_equal(_glyph("A")[:4], sh1107.image()[124:, 0:8])
+
+    def test_flips(self):
+        sh1107 = self._init()
+        self._print(sh1107, 15, 0, "A")
+
+        sh1107.cmd(Cmd.SetCommonOutputScanDirection("Backwards"))
+        np.testing.assert_array_equal(_glyph("A")[::-1], sh1107.image()[120:, 0:8])
+
+        sh1107.cmd(Cmd.SetSegmentRemap("Flipped"))
+        np.testing.assert_array_equal(
+            _glyph("A")[::-1, ::-1], sh1107.image()[120:, 120:]
+        )
+
+        sh1107.cmd(Cmd.SetDisplayReverse(True))
+        self.assertEqual(128 * 128 - _glyph("A").sum(), sh1107.image().sum())
+
+    def test_power(self):
+        sh1107 = self._init()
+        sh1107.cmd(Cmd.SetEntireDisplayOn(True))
+        self.assertTrue(sh1107.image().all())
+        sh1107.cmd(Cmd.DisplayOn(False))
+        self.assertFalse(sh1107.image().any())
@@ -0,0 +1,69 @@
+import os
+from argparse import ArgumentParser, Namespace
+
+from .rtl.oled import OLED
+
+__all__ = ["add_main_arguments"]
+
+
+def _write_pbm(path: str, image):
+    import numpy as np
+
+    height, width = image.shape
+    with open(path, "wb") as f:
+        f.write(b"P4\n%d %d\n" % (width, height))
+        # PBM's 1 is black; show it the way the OLED does.
+        f.write(np.packbits(~image, axis=1).tobytes())
+
+
+def add_main_arguments(parser: ArgumentParser):
+    parser.set_defaults(func=main)
+    parser.add_argument(
+        "capture",
+        help="VCD capture of the I²C bus, e.g. exported from sigrok",
+    )
+    parser.add_argument(
+        "--scl",
+        default="scl",
+        help="name of the SCL signal in the capture (default: scl)",
+    )
+    parser.add_argument(
+        "--sda",
+        default="sda",
+        help="name of the SDA signal in the capture (default: sda)",
+    )
+    parser.add_argument(
+        "-a",
+        "--addr",
+        type=lambda v: int(v, 0),
+        default=OLED.ADDR,
+        help=f"the display's address (default: 0x{OLED.ADDR:02X})",
+    )
+    parser.add_argument(
+        "-i",
+        "--interval",
+        type=float,
+        default=0.0,
+        help="write at most one frame per this many seconds of capture",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="build/replay",
+        help="directory to write frames to, as PBM (default: build/replay)",
+    )
+
+
+def main(args: Namespace):
+    # NumPy's only needed here, not by the rest of the CLI.
+    from .proto.capture import replay, vcd_transactions
+
+    os.makedirs(args.output, exist_ok=True)
+    transactions = vcd_transactions(args.capture, scl=args.scl, sda=args.sda)
+    count = 0
+    for time, image in replay(transactions, addr=args.addr, interval=args.interval):
+        path = os.path.join(args.output, f"{count:05}.pbm")
+        _write_pbm(path, image)
+        print(f"{time:.6f}: {path}")
+        count += 1
+    print(f"{count} frame(s)")
@@ -13,6 +13,7 @@ __all__ = [
     "ROM_ABITS",
     "ROM_CONTENT",
     "SEQ_COUNT",
+    "SEQ_INDEX",
     "OFFSET_INIT",
     "OFFSET_DISPLAY_ON",
     "OFFSET_DISPLAY_OFF",
@@ -116,8 +117,12 @@ rom_offset = SEQ_COUNT * 2 * 2
 
 rom = []
 index = b""
+# The same (offset, length) pairs as the index, for gateware that wants them
+# without reading the ROM.
+SEQ_INDEX: list[tuple[int, int]] = []
 for parts in seqs:
-    index += struct.pack("<HH", rom_offset + len(rom), len(parts[0]))
+    SEQ_INDEX.append((rom_offset + len(rom), len(parts[0])))
+    index += struct.pack("<HH", *SEQ_INDEX[-1])
     for i, part in enumerate(parts):
         rom.extend(part)
         if i == len(parts) - 1:
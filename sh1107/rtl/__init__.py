@@ -1,6 +1,6 @@
 from typing import Optional, cast
 
-from amaranth import Memory, Module, Record, Signal
+from amaranth import Memory, Module, Mux, Record, Signal
 from amaranth.build.res import ResourceError
 from amaranth.hdl import ReadPort
 from amaranth.lib.wiring import Component, In
@@ -241,42 +241,41 @@ class Top(Component):
                 raise NotImplementedError
 
         offset = Signal(range(self._rom_len))
-        remain = Signal(range(self._rom_len))
+        remain = Signal(range(self._rom_len + 1))
 
-        m.d.comb += self._rom_rd.addr.eq(offset)
+        cmd_bus = self._oled.cmd_bus
+        accepted = Signal()
+        m.d.comb += accepted.eq(cmd_bus.w_en & cmd_bus.w_rdy)
+
+        # Address the byte after the current one as soon as the current one is
+        # accepted, so the next is ready on the very next cycle: one byte per
+        # cycle into the command FIFO for as long as it has room.
+        m.d.comb += self._rom_rd.addr.eq(Mux(accepted, offset + 1, offset))
 
         with m.FSM():
             with m.State("IDLE"):
-                m.d.sync += self._oled.fifo_in.w_en.eq(0)
-
                 for i, button_up in enumerate(button_up_signals):
-                    with m.If(button_up & self._oled.fifo_in.w_rdy):
+                    with m.If(button_up):
                         m.d.sync += [
                             offset.eq(sum(len(seq) for seq in self._sequences[:i])),
                             remain.eq(len(self._sequences[i])),
                         ]
-                        m.next = "LOOP: ADDRESSED"
+                        m.next = "STREAM: ADDRESSED"
 
-            with m.State("LOOP: ADDRESSED"):
-                m.next = "LOOP: AVAILABLE"
+            with m.State("STREAM: ADDRESSED"):
+                m.next = "STREAM"
 
-            with m.State("LOOP: AVAILABLE"):
-                with m.If(self._oled.fifo_in.w_rdy):
-                    m.d.sync += [
-                        self._oled.fifo_in.w_data.eq(self._rom_rd.data),
-                        self._oled.fifo_in.w_en.eq(1),
-                    ]
-                    m.next = "LOOP: STROBED W_EN"
-
-            with m.State("LOOP: STROBED W_EN"):
-                m.d.sync += self._oled.fifo_in.w_en.eq(0)
-                with m.If(remain == 1):
-                    m.next = "IDLE"
-                with m.Else():
+            with m.State("STREAM"):
+                m.d.comb += [
+                    cmd_bus.w_data.eq(self._rom_rd.data),
+                    cmd_bus.w_en.eq(1),
+                ]
+                with m.If(accepted):
                     m.d.sync += [
                         offset.eq(offset + 1),
                         remain.eq(remain - 1),
                     ]
-                    m.next = "LOOP: ADDRESSED"
+                    with m.If(remain == 1):
+                        m.next = "IDLE"
 
         return m
@@ -0,0 +1,143 @@
+from typing import Final, Optional, cast
+
+from amaranth import Elaboratable, Module, Signal
+from amaranth.lib.wiring import Component, In, Out
+
+from ..base import Blackbox
+from ..platform import Platform, icebreaker, test
+from .common import Hz
+from .oled import OLED
+from .uart import UARTRx, UARTTx
+
+__all__ = ["Top"]
+
+
+class Top(Component):
+    """
+    Feeds OLED commands received over a UART straight into the OLED's command
+    FIFO, e.g. as encoded by sh1107.host.
+
+    Flow control is XON/XOFF: XOFF is sent once the FIFO fills past
+    HIGH_WATER, and XON once it's drained back to LOW_WATER.  The space above
+    HIGH_WATER is what the host may still send before it notices; any bytes
+    received with the FIFO full are dropped and latch overrun.
+    """
+
+    XON: Final[int] = 0x11
+    XOFF: Final[int] = 0x13
+
+    DEFAULT_BAUD: Final[int] = 115_200
+
+    # At 115200 baud, the 64 bytes over HIGH_WATER give the host ~5ms to react
+    # to XOFF.
+    FIFO_DEPTH: Final[int] = 256
+    HIGH_WATER: Final[int] = 192
+    LOW_WATER: Final[int] = 64
+
+    _oled: OLED
+    _uart_rx: UARTRx
+    _uart_tx: UARTTx
+    _speed: Hz
+    _baud: int
+
+    # Board pins on hardware; left as top-level ports in simulation.
+    rx: Out(1, init=1)
+    tx: In(1, init=1)
+
+    overrun: In(1)
+    stopped: In(1)
+
+    def __init__(
+        self,
+        *,
+        platform: Platform,
+        speed: Hz = Hz(400_000),
+        baud: int = DEFAULT_BAUD,
+    ):
+        super().__init__()
+
+        self._oled = OLED(platform=platform, speed=speed, fifo_depth=self.FIFO_DEPTH)
+        self._uart_rx = UARTRx(baud=baud)
+        self._uart_tx = UARTTx(baud=baud)
+        self._speed = speed
+        self._baud = baud
+
+    def ports(self, platform: Platform) -> list[Signal]:
+        ports = [self.rx, self.tx, self.overrun, self.stopped]
+
+        if Blackbox.I2C not in platform.blackboxes:
+            ports += [
+                self._oled._i2c.hw_bus.scl_o,
+                self._oled._i2c.hw_bus.scl_oe,
+                self._oled._i2c.hw_bus.sda_o,
+                self._oled._i2c.hw_bus.sda_oe,
+                self._oled._i2c.hw_bus.sda_i,
+            ]
+
+        return ports
+
+    def elaborate(self, platform: Optional[Platform]) -> Elaboratable:
+        m = Module()
+
+        m.submodules.oled = self._oled
+        m.submodules.uart_rx = self._uart_rx
+        m.submodules.uart_tx = self._uart_tx
+
+        match platform:
+            case icebreaker():
+                uart = platform.request("uart", 0)
+                m.d.comb += [
+                    self.rx.eq(uart.rx.i),
+                    uart.tx.o.eq(self.tx),
+                ]
+
+                led_overrun = cast(Signal, platform.request("led", 0).o)
+                led_flowing = cast(Signal, platform.request("led", 1).o)
+                m.d.comb += [
+                    led_overrun.eq(self.overrun),
+                    led_flowing.eq(~self.stopped),
+                ]
+
+            case test():
+                pass
+
+            case _:
+                raise NotImplementedError
+
+        cmd_bus = self._oled.cmd_bus
+        m.d.comb += [
+            self._uart_rx.rx.eq(self.rx),
+            self.tx.eq(self._uart_tx.tx),
+            cmd_bus.w_data.eq(self._uart_rx.data),
+            cmd_bus.w_en.eq(self._uart_rx.valid),
+        ]
+
+        with m.If(self._uart_rx.valid & ~cmd_bus.w_rdy):
+            m.d.sync += self.overrun.eq(1)
+
+        with m.FSM():
+            with m.State("IDLE"):
+                with m.If(~self.stopped & (cmd_bus.w_level >= self.HIGH_WATER)):
+                    m.d.sync += [
+                        self._uart_tx.data.eq(self.XOFF),
+                        self._uart_tx.stb.eq(1),
+                        self.stopped.eq(1),
+                    ]
+                    m.next = "FLOW: STROBED TX"
+                with m.Elif(self.stopped & (cmd_bus.w_level <= self.LOW_WATER)):
+                    m.d.sync += [
+                        self._uart_tx.data.eq(self.XON),
+                        self._uart_tx.stb.eq(1),
+                        self.stopped.eq(0),
+                    ]
+                    m.next = "FLOW: STROBED TX"
+
+            with m.State("FLOW: STROBED TX"):
+                m.d.sync += self._uart_tx.stb.eq(0)
+                m.next = "FLOW: UNSTROBED TX"
+
+            with m.State("FLOW: UNSTROBED TX"):
+                with m.If(~self._uart_tx.busy):
+                    m.next = "IDLE"
+
+        return m
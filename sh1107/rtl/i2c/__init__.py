@@ -1,6 +1,6 @@
 from typing import Final, Optional, Self, cast
 
-from amaranth import Elaboratable, Module, Signal
+from amaranth import Array, Elaboratable, Module, Signal
 from amaranth.build import Attrs
 from amaranth.lib import data, enum
 from amaranth.lib.fifo import SyncFIFO
@@ -10,7 +10,15 @@ from amaranth_boards.resources import I2CResource
 from ...platform import Platform, icebreaker, orangecrab
 from ..common import Counter, Hz
 
-__all__ = ["I2C", "I2CFormal", "I2CBus", "RW", "Transfer"]
+__all__ = [
+    "I2C",
+    "I2CFormal",
+    "I2CBus",
+    "I2CCountersBus",
+    "PerfCounter",
+    "RW",
+    "Transfer",
+]
 
 
 class RW(enum.IntEnum, shape=1):
@@ -72,6 +80,32 @@ I2CBus = Signature(
 )
 
 
+class PerfCounter(enum.IntEnum, shape=3):
+    # Bytes clocked out or in, including address bytes.
+    BYTES = 0
+    STARTS = 1
+    REP_STARTS = 2
+    NACKS = 3
+    # Cycles with no transaction in progress.  The controller never holds the
+    # bus mid-transaction -- it STOPs as soon as it finds its FIFO empty -- so
+    # this is where any gaps between bytes end up.
+    IDLE_CYCLES = 4
+    # Cycles from the controller taking a transfer from its FIFO to the driver
+    # queuing the next one in the same transaction.
+    STALL_CYCLES = 5
+
+
+# Read with addr set to a PerfCounter; data follows combinatorially.  clr
+# zeroes every counter.
+I2CCountersBus = Signature(
+    {
+        "addr": Out(PerfCounter),
+        "clr": Out(1),
+        "data": In(32),
+    }
+)
+
+
 I2CHardwareBus = Signature(
     {
         "scl_o": Out(1, init=1),
@@ -98,6 +132,9 @@ class I2C(Component):
     addr<7>, 1<1>).
 
     Read: Not yet implemented.
+
+    With counters=True, the PerfCounters are kept and can be read from the
+    counters port.  Otherwise it reads all zeroes.
     """
 
     VALID_SPEEDS: Final[list[int]] = [
@@ -118,6 +155,9 @@ class I2C(Component):
 
     bus: In(I2CBus)
     hw_bus: Out(I2CHardwareBus)
+    counters: In(I2CCountersBus)
+
+    _perf: Optional[list[Signal]]
 
     _rw: Signal
     _byte: Signal
@@ -128,7 +168,7 @@ class I2C(Component):
     _formal_repeated_start: Optional[Signal]
     _formal_stop: Optional[Signal]
 
-    def __init__(self, *, speed: Hz):
+    def __init__(self, *, speed: Hz, counters: bool = False):
         super().__init__()
 
         assert speed.value in self.VALID_SPEEDS
@@ -150,6 +190,14 @@ class I2C(Component):
         self._formal_repeated_start = None
         self._formal_stop = None
 
+        if counters:
+            self._perf = [
+                Signal(32, name=f"perf_{counter.name.lower()}")
+                for counter in PerfCounter
+            ]
+        else:
+            self._perf = None
+
     def elaborate(self, platform: Platform) -> Elaboratable:
         m = Module()
 
@@ -239,6 +287,8 @@ class I2C(Component):
                         self._byte_ix.eq(0),
                     ]
                     fh(m, self._formal_start, True)
+                    self.count(m, PerfCounter.BYTES)
+                    self.count(m, PerfCounter.STARTS)
 
                     m.next = "START: WAIT SCL"
 
@@ -283,6 +333,8 @@ class I2C(Component):
                     # Don't take SDA back until end of the cycle, otherwise it
                     # looks like a STOP condition if sda_o was left high.
                     m.d.sync += self.bus.ack.eq(~self.hw_bus.sda_i)
+                    with m.If(self.hw_bus.sda_i):
+                        self.count(m, PerfCounter.NACKS)
                     m.next = "COMMON ACK BIT: SCL HIGH"
 
             with m.State("READ DATA BIT: SCL LOW"):
@@ -354,6 +406,7 @@ class I2C(Component):
                                 self.hw_bus.sda_oe.eq(1),
                                 self.hw_bus.sda_o.eq(0),
                             ]
+                            self.count(m, PerfCounter.BYTES)
                             m.next = "WRITE DATA BIT: SCL LOW"
                         with m.Elif(
                             self.bus.ack
@@ -366,6 +419,7 @@ class I2C(Component):
                                 self._in_fifo.r_en.eq(1),
                                 self.hw_bus.sda_oe.eq(0),
                             ]
+                            self.count(m, PerfCounter.BYTES)
                             m.next = "READ DATA BIT: SCL LOW"
                         with m.Elif(
                             self.bus.ack
@@ -380,6 +434,8 @@ class I2C(Component):
                                 self.hw_bus.sda_oe.eq(1),
                                 self.hw_bus.sda_o.eq(0),
                             ]
+                            self.count(m, PerfCounter.BYTES)
+                            self.count(m, PerfCounter.REP_STARTS)
                             m.next = "REP START: SCL LOW"
                         with m.Else():
                             # Consume anything that got queued before the NACK was realised.
@@ -434,8 +490,38 @@ class I2C(Component):
                     ]
                     m.next = "IDLE"
 
+        self.elaborate_counters(m)
+
         return m
 
+    def count(self, m: Module, counter: PerfCounter):
+        if self._perf is not None:
+            m.d.sync += self._perf[counter].eq(self._perf[counter] + 1)
+
+    def elaborate_counters(self, m: Module):
+        if self._perf is None:
+            m.d.comb += self.counters.data.eq(0)
+            return
+
+        with m.If(~self.bus.busy):
+            self.count(m, PerfCounter.IDLE_CYCLES)
+
+        # Only charge a stall once the driver has actually followed up; the
+        # FIFO is empty for the whole of the last byte by design.
+        stall_run = Signal(32)
+        with m.If(self.bus.busy & ~self._in_fifo.r_rdy):
+            m.d.sync += stall_run.eq(stall_run + 1)
+        with m.Else():
+            m.d.sync += stall_run.eq(0)
+            with m.If(self.bus.busy):
+                stall = self._perf[PerfCounter.STALL_CYCLES]
+                m.d.sync += stall.eq(stall + stall_run)
+
+        m.d.comb += self.counters.data.eq(Array(self._perf)[self.counters.addr])
+
+        with m.If(self.counters.clr):
+            m.d.sync += [counter.eq(0) for counter in self._perf]
+
 
 def fh(m: Module, s: Optional[Signal], high: bool):
     if s is not None:
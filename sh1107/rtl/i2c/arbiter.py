@@ -0,0 +1,133 @@
+from amaranth import Elaboratable, Module, Signal
+from amaranth.lib.wiring import Component, In, Out, connect, flipped
+
+from ...platform import Platform
+from . import I2CBus
+
+__all__ = ["I2CArbiter"]
+
+
+class I2CArbiter(Component):
+    """
+    Shares one I2C controller between several engines.
+
+    An engine raises its bit of req for as long as it needs the bus; the
+    lowest index wins.  The last port has no request line: it's granted
+    whenever nobody else wants the bus, and holds it for any transaction it
+    starts, until the transaction's over or it raises release.
+
+    The grant never moves while its holder still wants the bus.  An engine
+    which starts a transaction while it can't have it has its START and stb
+    staged: it sees a busy bus with no room in the FIFO until it's granted
+    and the FIFO has room, at which point they're replayed to the controller
+    and it carries on as usual.
+
+    An engine can drop its request as soon as it's given the controller its
+    last byte, without waiting for the STOP.  The next engine's START then
+    goes straight into the FIFO behind it, and the controller turns what
+    would've been a STOP and START into a repeated START.  release does the
+    same for the last port.
+    """
+
+    _ports: int
+
+    _staged: list[Signal]
+    _staged_data: list[Signal]
+    _staged_stb: list[Signal]
+
+    def __init__(self, *, ports: int):
+        assert ports >= 2
+        self._ports = ports
+        super().__init__(
+            {
+                "ports": In(I2CBus).array(ports),
+                "req": Out(ports - 1),
+                "release": Out(1),
+                "bus": Out(I2CBus),
+                "grant": In(range(ports), init=ports - 1),
+            }
+        )
+
+        self._staged = [Signal(name=f"staged_{i}") for i in range(ports)]
+        self._staged_data = [Signal(9, name=f"staged_data_{i}") for i in range(ports)]
+        self._staged_stb = [Signal(name=f"staged_stb_{i}") for i in range(ports)]
+
+    def elaborate(self, platform: Platform) -> Elaboratable:
+        m = Module()
+
+        default = self._ports - 1
+
+        owner = Signal.like(self.grant)
+        m.d.sync += owner.eq(self.grant)
+
+        # Between the START being written and the controller going busy, the
+        # transaction's still underway.  (The I2C blackbox doesn't give us
+        # in_fifo_r_rdy, so we can't just look at the FIFO.)
+        starting = Signal()
+        with m.If(self.bus.busy):
+            m.d.sync += starting.eq(0)
+        with m.Elif(self.bus.in_fifo_w_en):
+            m.d.sync += starting.eq(1)
+        active = self.bus.busy | starting
+
+        # The default port has no request line, so note when it's the one
+        # that started what's on the bus.
+        default_active = Signal()
+        with m.If((self.grant == default) & self.ports[default].in_fifo_w_en):
+            m.d.sync += default_active.eq(1)
+        with m.Elif(~active | self.release):
+            m.d.sync += default_active.eq(0)
+
+        held = Signal()
+        m.d.comb += held.eq(default_active)
+        for i in range(self._ports - 1):
+            with m.If(owner == i):
+                m.d.comb += held.eq(self.req[i])
+
+        with m.If(active & held):
+            m.d.comb += self.grant.eq(owner)
+        with m.Else():
+            m.d.comb += self.grant.eq(default)
+            for i in reversed(range(self._ports - 1)):
+                with m.If(self.req[i] | self._staged[i] | self._staged_stb[i]):
+                    m.d.comb += self.grant.eq(i)
+
+        for i, port in enumerate(self.ports):
+            staged = self._staged[i]
+            staged_data = self._staged_data[i]
+            staged_stb = self._staged_stb[i]
+            granted = self.grant == i
+            through = granted & ~staged & ~staged_stb
+
+            with m.If(through):
+                connect(m, flipped(port), flipped(self.bus))
+            with m.Elif(granted & staged):
+                with m.If(self.bus.in_fifo_w_rdy):
+                    m.d.comb += [
+                        self.bus.in_fifo_w_data.eq(staged_data),
+                        self.bus.in_fifo_w_en.eq(1),
+                    ]
+                    m.d.sync += staged.eq(0)
+            with m.Elif(granted):
+                m.d.comb += self.bus.stb.eq(1)
+                m.d.sync += staged_stb.eq(0)
+
+            with m.If(staged | staged_stb):
+                m.d.comb += [
+                    port.busy.eq(1),
+                    port.ack.eq(1),
+                ]
+            with m.Elif(~granted):
+                m.d.comb += port.ack.eq(self.bus.ack)
+
+            # Engines write their START without checking for room, so it's
+            # kept until there is some.
+            with m.If(port.in_fifo_w_en & ~(through & self.bus.in_fifo_w_rdy)):
+                m.d.sync += [
+                    staged.eq(1),
+                    staged_data.eq(port.in_fifo_w_data),
+                ]
+            with m.If(port.stb & ~through):
+                m.d.sync += staged_stb.eq(1)
+
+        return m
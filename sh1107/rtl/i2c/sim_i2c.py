@@ -1,6 +1,8 @@
 from enum import Enum
-from typing import Callable, Literal, Optional, cast
+from typing import Any, Callable, Literal, Optional, cast
+from weakref import WeakKeyDictionary
 
+import numpy as np
 from amaranth import Signal
 from amaranth.sim import Delay
 
@@ -16,7 +18,10 @@ __all__ = [
     "nack",
     "stop",
     "steady_stopped",
+    "nack_positions",
     "full_sequence",
+    "BusLog",
+    "logged",
 ]
 
 
@@ -24,6 +29,12 @@ def _tick(i2c: I2C) -> float:
     return 0.1 / i2c.speed.value
 
 
+def _changed(i2c: I2C, *signals: Signal) -> sim.Procedure:
+    # Nothing on the bus takes longer than a bit time to happen.
+    changed = yield sim.Changed(*signals, timeout=10 * _tick(i2c))
+    assert changed, "I2C lines stuck"
+
+
 def synchronise(i2c: I2C, start_value: int, *, wait_steps: int = 20) -> sim.Procedure:
     for i in range(wait_steps):
         if i > 0:
@@ -154,7 +165,9 @@ def wait_scl(
     yield from vcw_sda_oe.start()
 
     while True:
-        yield Delay(_tick(i2c))
+        yield from _changed(
+            i2c, i2c.hw_bus.scl_o, i2c.hw_bus.sda_o, i2c.hw_bus.sda_oe
+        )
 
         yield from vcw_sda_o.update()
         yield from vcw_sda_oe.update()
@@ -218,26 +231,26 @@ def ack(
         # Controller takes SDA.
         assert not (yield i2c.hw_bus.sda_oe)
 
-        yield Delay(4 * _tick(i2c))
+        yield from wait_scl(i2c, 1, sda_oe=ValueChange.DONT_CARE)
         assert (yield i2c.hw_bus.sda_oe)
         assert ack ^ (
             yield i2c.hw_bus.sda_o
         ), f"expected ack {ack} from us, got {not ack}"  # ACK/low or NACK/high
-        yield Delay(6 * _tick(i2c))
+        # It may let SDA go as soon as SCL falls.
+        yield from wait_scl(i2c, 0, sda_oe=ValueChange.DONT_CARE)
+        yield Delay(_tick(i2c))
 
         assert retakes_sda == (yield i2c.hw_bus.sda_oe)
 
     else:
         # Controller releases SDA; we ACK by driving SDA low.
         assert not (yield i2c.hw_bus.sda_oe)
-        yield Delay(_tick(i2c))
         if ack:
             yield cast(Signal, i2c.hw_bus.sda_i).eq(0)
-        yield Delay(3 * _tick(i2c))
+        yield from wait_scl(i2c, 1)
         assert not (yield i2c.hw_bus.sda_oe)
-        yield Delay(_tick(i2c))
-
-        yield Delay(4 * _tick(i2c))
+        # It may take SDA back as soon as SCL falls.
+        yield from wait_scl(i2c, 0, sda_oe=ValueChange.DONT_CARE)
         if ack:
             yield cast(Signal, i2c.hw_bus.sda_i).eq(1)
         yield Delay(_tick(i2c))
@@ -259,17 +272,19 @@ def stop(i2c: I2C) -> sim.Procedure:
 
     # Now while SCL is high, bring SDA high.
     while True:
-        yield Delay(_tick(i2c))
+        yield from _changed(i2c, i2c.hw_bus.scl_o, i2c.hw_bus.sda_o)
         assert (yield i2c.hw_bus.scl_o)
         if (yield i2c.hw_bus.sda_o):
             break
 
 
 def steady_stopped(i2c: I2C, *, wait_steps: int = 5) -> sim.Procedure:
-    for _ in range(wait_steps):
-        yield Delay(_tick(i2c))
-        assert (yield i2c.hw_bus.scl_o)
-        assert (yield i2c.hw_bus.sda_o)
+    assert (yield i2c.hw_bus.scl_o)
+    assert (yield i2c.hw_bus.sda_o)
+    changed = yield sim.Changed(
+        i2c.hw_bus.scl_o, i2c.hw_bus.sda_o, timeout=wait_steps * _tick(i2c)
+    )
+    assert not changed, "I2C lines moved after STOP"
 
     assert not (
         yield i2c.bus.in_fifo_r_rdy
@@ -277,13 +292,227 @@ def steady_stopped(i2c: I2C, *, wait_steps: int = 5) -> sim.Procedure:
     assert not (yield i2c.bus.busy)
 
 
+# Event codes for BusLog: a bit's value, or one of these.
+_START = 2
+_STOP = 3
+
+
+class BusLog:
+    """
+    Every change on an I2C controller's lines, recorded by a background
+    process as it happens rather than polled for, so a transaction can be
+    checked in one go once it's finished.  The process also plays the
+    target: it ACKs every byte but the one at nack_at.
+
+    Add it to a sim test with @logged; full_sequence then uses it.
+    """
+
+    i2c: I2C
+    nack_at: Optional[int]
+
+    _changes: list[tuple[int, int]]
+    _byte: int
+
+    def __init__(self, i2c: I2C):
+        self.i2c = i2c
+        self.nack_at = None
+        self._changes = []
+        self._byte = 0
+        _logs[i2c] = self
+
+    def clear(self):
+        # Keep where the lines are now, for the first change to be seen from.
+        del self._changes[:-1]
+        self._byte = 0
+
+    @property
+    def stopped(self) -> bool:
+        return len(self._changes) > 1 and self._changes[-1] == (1, 1)
+
+    async def process(self, ctx: Any):
+        hw_bus = self.i2c.hw_bus
+        sda_i = cast(Signal, hw_bus.sda_i)
+
+        def line(sda_o: int, sda_oe: int, sda_i: int) -> int:
+            # Open drain: either side can pull it low.
+            return (sda_o | ~sda_oe) & sda_i & 1
+
+        # Both lines start released.
+        scl = sda = 1
+        self._changes.append((scl, sda))
+        # Falling SCL edges since the last START or byte.
+        falls = 0
+
+        async for values in ctx.changed(
+            hw_bus.scl_o, hw_bus.sda_o, hw_bus.sda_oe, sda_i
+        ):
+            new_scl, new_sda = values[0], line(*values[1:])
+            if (new_scl, new_sda) == (scl, sda):
+                continue
+
+            if scl and new_scl and sda and not new_sda:
+                # START; the falling edge that ends it isn't a bit's.
+                falls = -1
+            elif scl and not new_scl:
+                falls += 1
+                if falls == 8:
+                    ctx.set(sda_i, self._byte == self.nack_at)
+                elif falls == 9:
+                    ctx.set(sda_i, 1)
+                    falls = 0
+                    self._byte += 1
+
+            scl, sda = new_scl, new_sda
+            self._changes.append((scl, sda))
+
+    def events(self) -> list[int]:
+        """
+        The bits, STARTs and STOPs since the last clear, decoded in one pass.
+        """
+        changes = np.array(self._changes, dtype=np.int8)
+        scl, sda = changes[1:, 0], changes[1:, 1]
+        prev_scl, prev_sda = changes[:-1, 0], changes[:-1, 1]
+
+        rise = (scl == 1) & (prev_scl == 0)
+        fall = (scl == 0) & (prev_scl == 1)
+        held = (scl == 1) & (prev_scl == 1)
+        start = held & (prev_sda == 1) & (sda == 0)
+        stop = held & (prev_sda == 0) & (sda == 1)
+
+        # A bit is a rising edge followed by a falling one; one followed by a
+        # START or STOP is just the clock going high for it.
+        at = np.flatnonzero(rise | fall | start | stop)
+        kind = np.select(
+            [rise[at], fall[at], start[at]], [0, 1, _START], default=_STOP
+        )
+        bit = (kind == 0) & (np.append(kind[1:], -1) == 1)
+        keep = bit | (kind >= _START)
+        return np.where(bit, sda[at], kind)[keep].tolist()
+
+
+_logs: "WeakKeyDictionary[I2C, BusLog]" = WeakKeyDictionary()
+
+
+def logged(i2c: Callable[[Any], I2C]):
+    """
+    Record the bus of the controller i2c returns from the DUT with a BusLog.
+    """
+    return sim.processes(lambda dut: [BusLog(i2c(dut)).process])
+
+
+def _expected_events(sequence: list[int], nack_after: Optional[int]) -> list[int]:
+    events = [_START]
+    for i, byte in enumerate(sequence):
+        if (byte & 0x100) and i > 0:
+            events.append(_START)
+        events += [(byte >> (7 - bit)) & 1 for bit in range(8)]
+        events.append(int(i == nack_after))
+        if i == nack_after:
+            break
+    events.append(_STOP)
+    return events
+
+
+def _describe(events: list[int]) -> str:
+    out: list[str] = []
+    bits: list[int] = []
+    for event in events + [_STOP]:
+        if event < _START:
+            bits.append(event)
+            continue
+        for i in range(0, len(bits), 9):
+            byte = bits[i : i + 9]
+            value = sum(b << (7 - j) for j, b in enumerate(byte[:8]))
+            ack = {0: "A", 1: "N"}.get(byte[8] if len(byte) > 8 else -1, "?")
+            out.append(f"{value:02x}{ack}" if len(byte) >= 8 else f"{byte}")
+        bits = []
+        out.append({_START: "S", _STOP: "P"}[event])
+    return " ".join(out[:-1])
+
+
+def _logged_sequence(
+    log: BusLog,
+    trigger: Callable[[], sim.Procedure],
+    sequence: list[int],
+    nacks: list[Optional[int]],
+) -> sim.Procedure:
+    i2c = log.i2c
+    # A byte and its ACK.
+    byte_time = 9 / i2c.speed.value
+
+    for nack_after in nacks:
+        log.clear()
+        log.nack_at = nack_after
+        yield from trigger()
+
+        for _ in range(len(sequence) + 10):
+            yield Delay(byte_time)
+            if log.stopped and not (yield i2c.bus.busy):
+                break
+        else:
+            raise AssertionError("I2C didn't finish")
+
+        when = "" if nack_after is None else f" NACKing byte {nack_after}"
+        expected = _expected_events(sequence, nack_after)
+        actual = log.events()
+        assert (
+            actual == expected
+        ), f"expected {_describe(expected)}, got {_describe(actual)}{when}"
+
+        # Give the DUT as long to settle as steady_stopped does.
+        yield Delay(5 * _tick(i2c))
+        assert not (
+            yield i2c.bus.in_fifo_r_rdy
+        ), f"unexpected data waiting on I2C in fifo{when}: {(yield i2c.bus.in_fifo_w_data):02x}"
+
+
+# Sequences up to this long have a NACK tried at every byte.
+NACK_SAMPLES: int = 16
+
+
+def nack_positions(sequence: list[int], samples: Optional[int]) -> list[int]:
+    """
+    Which bytes of sequence to try NACKing: all of them if there are no more
+    than samples, or samples is None.  Otherwise, the first two, the last
+    two, and those at and either side of every repeated START, which are
+    where the controller does something different; then, if that's fewer
+    than samples, evenly spread ones from the rest to make up the number.
+    """
+    n = len(sequence)
+    if samples is None or n <= samples:
+        return list(range(n))
+
+    picked = {0, 1, n - 2, n - 1}
+    for i, byte in enumerate(sequence):
+        if (byte & 0x100) and i > 0:
+            picked |= {i - 1, i, i + 1}
+    picked &= set(range(n))
+
+    rest = [i for i in range(n) if i not in picked]
+    spare = samples - len(picked)
+    if spare > 0:
+        picked |= {rest[(j * len(rest)) // spare] for j in range(spare)}
+    return sorted(picked)
+
+
 def full_sequence(
     i2c: I2C,
     trigger: Callable[[], sim.Procedure],
     sequences: list[int | list[int]],
     *,
     test_nacks: bool = True,
+    nack_samples: Optional[int] = NACK_SAMPLES,
 ) -> sim.Procedure:
+    """
+    Trigger a transaction, check it's exactly sequences, and ACK it; then do
+    so again NACKing each byte in turn, or a sample of them for long
+    sequences; see nack_positions.
+
+    If the test has a BusLog on i2c, the bus is checked from it after each
+    transaction.  Otherwise it's stepped through as it happens, which checks
+    the controller's FIFO as it goes and SDA between edges too, but costs a
+    lot more to simulate.
+    """
     sequence: list[int] = []
     for item in sequences:
         if isinstance(item, int):
@@ -293,7 +522,11 @@ def full_sequence(
 
     nacks: list[Optional[int]] = [None]
     if test_nacks:
-        nacks += list(range(len(sequence)))
+        nacks += nack_positions(sequence, nack_samples)
+
+    if (log := _logs.get(i2c)) is not None:
+        yield from _logged_sequence(log, trigger, sequence, nacks)
+        return
 
     for nack_after in nacks:
         yield from trigger()
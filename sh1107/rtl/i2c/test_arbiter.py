@@ -0,0 +1,54 @@
+from amaranth.sim import Tick
+
+from ... import sim
+from .test_arbiter_top import TestI2CArbiterTop
+
+
+class TestI2CArbiter(sim.TestCase):
+    @sim.always_args([0x178, 0x01, 0x02], [0x17A, 0xAF, 0x8C])
+    @sim.i2c_speeds
+    def test_sim_i2c_arbiter(self, dut: TestI2CArbiterTop) -> sim.Procedure:
+        i2c = dut._i2c
+        arbiter = dut._arbiter
+        in_fifo = i2c._in_fifo
+
+        transactions: list[list[int]] = []
+        was_busy = False
+
+        def step() -> sim.Procedure:
+            nonlocal was_busy
+            yield Tick()
+            if (yield in_fifo.r_en) and (yield in_fifo.r_rdy):
+                if not was_busy:
+                    transactions.append([])
+                transactions[-1].append((yield in_fifo.r_data))
+            was_busy = bool((yield i2c.bus.busy))
+
+        # The second (default) writer gets the bus.
+        yield dut._second.switch.eq(1)
+        yield Tick()
+        yield dut._second.switch.eq(0)
+        while not (yield i2c.bus.busy):
+            yield from step()
+
+        # The first asks for it while the second's mid-transaction.  It's made
+        # to wait, with its START staged.
+        yield dut._first.switch.eq(1)
+        yield Tick()
+        yield dut._first.switch.eq(0)
+        for _ in range(3):
+            yield from step()
+        self.assertEqual(1, (yield arbiter.grant))
+        self.assertTrue((yield arbiter.ports[0].busy))
+        self.assertFalse((yield arbiter.ports[0].in_fifo_w_rdy))
+
+        # It gets it once the second's transaction is over, and not before.
+        while (yield arbiter.grant) == 1:
+            self.assertTrue((yield dut._second.busy))
+            yield from step()
+        self.assertFalse((yield i2c.bus.busy))
+
+        while (yield dut._first.busy):
+            yield from step()
+
+        self.assertEqual([[0x17A, 0xAF, 0x8C], [0x178, 0x01, 0x02]], transactions)
@@ -0,0 +1,106 @@
+from amaranth import Elaboratable, Module
+from amaranth.lib.wiring import Component, In, Out, connect
+
+from ...platform import Platform
+from ..common import Hz
+from . import I2C, I2CBus
+from .arbiter import I2CArbiter
+
+
+class _Writer(Component):
+    _data: list[int]
+
+    switch: Out(1)
+    bus: Out(I2CBus)
+
+    busy: In(1)
+
+    def __init__(self, data: list[int]):
+        assert len(data) >= 1
+        self._data = data
+        super().__init__()
+
+    def elaborate(self, platform: Platform) -> Elaboratable:
+        m = Module()
+
+        bus = self.bus
+
+        with m.FSM():
+            with m.State("IDLE"):
+                with m.If(self.switch):
+                    m.d.sync += [
+                        self.busy.eq(1),
+                        bus.in_fifo_w_data.eq(self._data[0]),
+                        bus.in_fifo_w_en.eq(1),
+                    ]
+                    m.next = "START: W_EN LATCHED"
+
+            with m.State("START: W_EN LATCHED"):
+                m.d.sync += [
+                    bus.in_fifo_w_en.eq(0),
+                    bus.stb.eq(1),
+                ]
+                m.next = "START: STROBED"
+
+            with m.State("START: STROBED"):
+                m.d.sync += bus.stb.eq(0)
+                m.next = "LOOP: UNLATCHED DATA[0]"
+
+            for i, datum in list(enumerate(self._data))[1:]:
+                with m.State(f"LOOP: UNLATCHED DATA[{i-1}]"):
+                    with m.If(bus.busy & bus.ack & bus.in_fifo_w_rdy):
+                        m.d.sync += [
+                            bus.in_fifo_w_data.eq(datum),
+                            bus.in_fifo_w_en.eq(1),
+                        ]
+                        m.next = f"LOOP: LATCHED DATA[{i}]"
+                    with m.Elif(~bus.busy):
+                        m.d.sync += self.busy.eq(0)
+                        m.next = "IDLE"
+
+                with m.State(f"LOOP: LATCHED DATA[{i}]"):
+                    m.d.sync += bus.in_fifo_w_en.eq(0)
+                    m.next = f"LOOP: UNLATCHED DATA[{i}]"
+
+            with m.State(f"LOOP: UNLATCHED DATA[{len(self._data) - 1}]"):
+                with m.If(~bus.busy):
+                    m.d.sync += self.busy.eq(0)
+                    m.next = "IDLE"
+
+        return m
+
+
+class TestI2CArbiterTop(Elaboratable):
+    """
+    Two writers sharing one I2C: the first with priority, the second by
+    default.  The peripheral ACKs everything.
+    """
+
+    _i2c: I2C
+    _arbiter: I2CArbiter
+    _first: _Writer
+    _second: _Writer
+
+    def __init__(self, first: list[int], second: list[int], *, speed: Hz):
+        self._i2c = I2C(speed=speed)
+        self._arbiter = I2CArbiter(ports=2)
+        self._first = _Writer(first)
+        self._second = _Writer(second)
+
+    def elaborate(self, platform: Platform) -> Elaboratable:
+        m = Module()
+
+        m.submodules.i2c = self._i2c
+        m.submodules.arbiter = self._arbiter
+        m.submodules.first = self._first
+        m.submodules.second = self._second
+
+        connect(m, self._arbiter.bus, self._i2c.bus)
+        connect(m, self._arbiter.ports[0], self._first.bus)
+        connect(m, self._arbiter.ports[1], self._second.bus)
+        m.d.comb += [
+            self._arbiter.req[0].eq(self._first.busy),
+            self._i2c.hw_bus.sda_i.eq(0),
+        ]
+
+        return m
@@ -1,7 +1,7 @@
 from amaranth.sim import Delay, Tick
 
 from ... import sim
-from . import RW, Transfer, sim_i2c
+from . import RW, PerfCounter, Transfer, sim_i2c
 from .test_i2c_top import TestI2CTop
 
 
@@ -56,3 +56,47 @@ class TestI2C(sim.TestCase):
                 0x8C,
             ],
         )
+
+    @sim.always_args(
+        [
+            Transfer.C_start(RW.W, 0x3C),
+            Transfer.C_data(0xAF),
+            Transfer.C_start(RW.W, 0x3D),
+            Transfer.C_data(0x8C),
+        ],
+        counters=True,
+    )
+    @sim.i2c_speeds
+    def test_sim_i2c_counters(self, dut: TestI2CTop) -> sim.Procedure:
+        def trigger() -> sim.Procedure:
+            yield dut.switch.eq(1)
+            yield Tick()
+            yield dut.switch.eq(0)
+
+        def read(counter: PerfCounter) -> sim.Generator[int]:
+            yield dut._i2c.counters.addr.eq(counter)
+            yield Delay(sim.clock() / 4)
+            return (yield dut._i2c.counters.data)
+
+        # One clean run, then one NACKing after each byte in turn.
+        yield from sim_i2c.full_sequence(
+            dut._i2c,
+            trigger,
+            [0x178, 0xAF, 0x17A, 0x8C],
+        )
+
+        self.assertEqual(4 + 1 + 2 + 3 + 4, (yield from read(PerfCounter.BYTES)))
+        self.assertEqual(5, (yield from read(PerfCounter.STARTS)))
+        self.assertEqual(3, (yield from read(PerfCounter.REP_STARTS)))
+        self.assertEqual(4, (yield from read(PerfCounter.NACKS)))
+        assert (yield from read(PerfCounter.IDLE_CYCLES)) > 0
+        stalls = yield from read(PerfCounter.STALL_CYCLES)
+        assert 0 < stalls < 5 * 14, stalls
+
+        yield dut._i2c.counters.clr.eq(1)
+        yield Tick()
+        yield dut._i2c.counters.clr.eq(0)
+        yield Tick()
+        for counter in PerfCounter:
+            if counter != PerfCounter.IDLE_CYCLES:
+                self.assertEqual(0, (yield from read(counter)), counter)
@@ -13,7 +13,9 @@ class TestI2CTop(Component):
 
     _i2c: I2C
 
-    def __init__(self, data: list[int | Value], *, speed: Hz):
+    def __init__(
+        self, data: list[int | Value], *, speed: Hz, counters: bool = False
+    ):
         assert len(data) >= 1
         for datum in data:
             assert isinstance(datum, ValueCastable) or (0 <= datum <= 0x1FF)
@@ -27,7 +29,7 @@ class TestI2CTop(Component):
             }
         )
 
-        self._i2c = I2C(speed=speed)
+        self._i2c = I2C(speed=speed, counters=counters)
 
     def elaborate(self, platform: Platform) -> Elaboratable:
         m = Module()
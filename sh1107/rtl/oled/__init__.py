@@ -1,23 +1,27 @@
 import math
+import struct
 from typing import Final
 
-from amaranth import (C, Cat, ClockSignal, Elaboratable, Instance, Memory,
-                      Module, Mux, Signal)
+from amaranth import (Array, C, Cat, ClockSignal, Elaboratable, Instance,
+                      Memory, Module, Mux, Signal)
 from amaranth.lib.enum import IntEnum
-from amaranth.lib.fifo import SyncFIFO
+from amaranth.lib.fifo import SyncFIFO, SyncFIFOBuffered
 from amaranth.lib.wiring import Component, In, Out, connect, flipped
 
 from ... import rom
 from ...base import Blackbox
 from ...platform import Platform, icebreaker
+from ...proto import Cmd, ControlByte
 from ..common import Counter, Hz
-from ..i2c import I2C, I2CBus
+from ..i2c import I2C, RW, I2CBus, I2CCountersBus, Transfer
+from ..i2c.arbiter import I2CArbiter
 from ..spi import SPIFlashReader, SPIFlashReaderBus
 from .clser import Clser
+from .command_bus import CommandBus
 from .locator import Locator
 from .rom_bus import ROMBus
-from .rom_writer import ROMWriter
-from .scroller import Scroller
+from .scroller import scroll_patches
+from .sequence_player import SequencePlayer
 
 __all__ = ["OLED"]
 
@@ -46,6 +50,10 @@ class OLED(Component):
     DEFAULT_SPEED: Final[int] = 400_000
     DEFAULT_SPEED_VSH: Final[int] = 2_000_000
 
+    # Enough to hold a handful of short commands, or a good chunk of a PRINT
+    # payload, without the producer having to wait on us.
+    DEFAULT_FIFO_DEPTH: Final[int] = 32
+
     class Command(IntEnum, shape=8):
         NOP = 0x00
         INIT = 0x01
@@ -59,6 +67,8 @@ class OLED(Component):
         ID = 0x09
         PRINT_BYTE = 0x0A
         SPI_TEST = 0x0B
+        BLIT = 0x0C
+        FILL_RECT = 0x0D
 
     class Result(IntEnum, shape=2):
         SUCCESS = 0
@@ -71,7 +81,10 @@ class OLED(Component):
 
     i2c_bus: Out(I2CBus)
     own_i2c_bus: Out(I2CBus)
+    # Only live with i2c_counters=True; see I2C.
+    i2c_counters: In(I2CCountersBus)
     _i2c: I2C | Instance
+    _i2c_arbiter: I2CArbiter
     # For blackbox simulation only; not defined otherwise.
     _i_i2c_bb_in_ack: Signal
     _i_i2c_bb_in_out_fifo_data: Signal
@@ -86,13 +99,15 @@ class OLED(Component):
     own_rom_bus: Out(ROMBus(rom.ROM_ABITS, 8))
     _rom_mem: Instance | Memory
 
-    _rom_writer: ROMWriter
+    _player: SequencePlayer
     _locator: Locator
     _clser: Clser
-    _scroller: Scroller
+    # How many times we've scrolled since INIT, mod 16.
+    _adjusted: Signal
     _cursor_c: Counter
 
-    _fifo_in: SyncFIFO
+    cmd_bus: In(CommandBus)
+    fifo_in: SyncFIFOBuffered
     result: In(Result, init=Result.BUSY)
 
     _row: Signal
@@ -105,12 +120,25 @@ class OLED(Component):
     _chpr_data: Signal
     _chpr_advance: Signal
     _chpr_run: Signal
+    # Where the panel's RAM pointer is, as a character position, so it's only
+    # moved when a character's drawn somewhere else.  A row of 0 means we
+    # don't know.
+    _panel_row: Signal
+    _panel_col: Signal
+
+    # High when the command FSM is waiting for a command (or a cursor blink);
+    # result alone doesn't say when everything kicked off by a command is done.
+    _idle: Signal
+    # The command being run, or last run; INIT is run from reset.
+    _command: Signal
 
     def __init__(
         self,
         *,
         platform: Platform,
         speed: Hz,
+        fifo_depth: int = DEFAULT_FIFO_DEPTH,
+        i2c_counters: bool = False,
     ):
         self._addr = OLED.ADDR
         self._cursor_rate = 0.5
@@ -119,9 +147,10 @@ class OLED(Component):
         super().__init__()
 
         assert speed.value in self.VALID_SPEEDS
+        assert 1 <= fifo_depth < 2 ** len(self.cmd_bus.w_level)
 
         if Blackbox.I2C not in platform.blackboxes:
-            self._i2c = I2C(speed=speed)
+            self._i2c = I2C(speed=speed, counters=i2c_counters)
         else:
             self._i_i2c_bb_in_ack = Signal()
             self._i_i2c_bb_in_out_fifo_data = Signal(8)
@@ -159,13 +188,16 @@ class OLED(Component):
 
         self._rom_wr_en = Signal()
         self._rom_wr_data = Signal(8)
-        self._rom_writer = ROMWriter(addr=self._addr)
+        self._i2c_arbiter = I2CArbiter(ports=4)
+        self._adjusted = Signal(range(16))
+        self._player = SequencePlayer(
+            addr=self._addr, patches=scroll_patches(self._adjusted)
+        )
         self._locator = Locator(addr=self._addr)
         self._clser = Clser(addr=self._addr)
-        self._scroller = Scroller(addr=self._addr)
         self._cursor_c = Counter(time=self._cursor_rate)
 
-        self.fifo_in = SyncFIFO(width=8, depth=1)
+        self.fifo_in = SyncFIFOBuffered(width=8, depth=fifo_depth)
 
         self._row = Signal(range(1, 17), init=1)
         self._col = Signal(range(1, 17), init=1)
@@ -177,6 +209,11 @@ class OLED(Component):
         self._chpr_data = Signal(8)
         self._chpr_advance = Signal(init=1)
         self._chpr_run = Signal()
+        self._panel_row = Signal(range(17))
+        self._panel_col = Signal(range(17))
+
+        self._idle = Signal()
+        self._command = Signal(8, init=OLED.Command.INIT)
 
     def elaborate(self, platform: Platform) -> Elaboratable:
         m = Module()
@@ -186,17 +223,24 @@ class OLED(Component):
 
         m.d.comb += self._cursor_c.en.eq(self._cursor_en)
 
-        command = Signal(8)
+        command = self._command
+
+        with m.FSM(name="cmd") as fsm:
+            m.d.comb += self._idle.eq(fsm.ongoing("IDLE"))
 
-        with m.FSM():
             with m.State("INIT: BEGIN"):
-                m.d.sync += [
-                    self.own_rom_bus.addr.eq(0),
-                    self.spifr_bus.addr.eq(platform.flash_rom_base),
-                    self.spifr_bus.len.eq(rom.ROM_LENGTH),
-                    self.spifr_bus.stb.eq(1),
-                ]
-                m.next = "INIT: STROBED SPIFR"
+                if platform.preload_rom:
+                    # See elaborate_memory; nothing to copy.
+                    m.d.sync += self.result.eq(OLED.Result.SUCCESS)
+                    m.next = "IDLE"
+                else:
+                    m.d.sync += [
+                        self.own_rom_bus.addr.eq(0),
+                        self.spifr_bus.addr.eq(platform.flash_rom_base),
+                        self.spifr_bus.len.eq(rom.ROM_LENGTH),
+                        self.spifr_bus.stb.eq(1),
+                    ]
+                    m.next = "INIT: STROBED SPIFR"
 
             with m.State("INIT: STROBED SPIFR"):
                 m.d.sync += self.spifr_bus.stb.eq(0)
@@ -258,25 +302,26 @@ class OLED(Component):
 
                     with m.Case(OLED.Command.INIT):
                         m.d.sync += [
-                            self._rom_writer.index.eq(rom.OFFSET_INIT),
-                            self._rom_writer.stb.eq(1),
+                            self._player.index.eq(rom.OFFSET_INIT),
+                            self._player.stb.eq(1),
                             self._row.eq(1),
                             self._col.eq(1),
-                            self._scroller.rst.eq(1),
+                            self._adjusted.eq(0),
+                            self._panel_row.eq(0),
                         ]
                         m.next = "INIT: STROBED ROM WRITER"
 
                     with m.Case(OLED.Command.DISPLAY_ON):
                         m.d.sync += [
-                            self._rom_writer.index.eq(rom.OFFSET_DISPLAY_ON),
-                            self._rom_writer.stb.eq(1),
+                            self._player.index.eq(rom.OFFSET_DISPLAY_ON),
+                            self._player.stb.eq(1),
                         ]
                         m.next = "ROM WRITE SINGLE: STROBED ROM WRITER"
 
                     with m.Case(OLED.Command.DISPLAY_OFF):
                         m.d.sync += [
-                            self._rom_writer.index.eq(rom.OFFSET_DISPLAY_OFF),
-                            self._rom_writer.stb.eq(1),
+                            self._player.index.eq(rom.OFFSET_DISPLAY_OFF),
+                            self._player.stb.eq(1),
                         ]
                         m.next = "ROM WRITE SINGLE: STROBED ROM WRITER"
 
@@ -285,6 +330,7 @@ class OLED(Component):
                             self._clser.stb.eq(1),
                             self._row.eq(1),
                             self._col.eq(1),
+                            self._panel_row.eq(0),
                         ]
                         m.next = "CLSER: STROBED"
 
@@ -309,6 +355,7 @@ class OLED(Component):
                         m.next = "CURSOR_OFF: RESET"
 
                     with m.Case(OLED.Command.ID):
+                        m.d.sync += self._panel_row.eq(0)
                         m.next = "ID: START"
 
                     with m.Case(OLED.Command.PRINT_BYTE):
@@ -317,11 +364,16 @@ class OLED(Component):
                     with m.Case(OLED.Command.SPI_TEST):
                         m.next = "SPI_TEST: START"
 
+                    with m.Case(OLED.Command.BLIT, OLED.Command.FILL_RECT):
+                        m.d.sync += self._panel_row.eq(0)
+                        m.next = "BLIT: ARGS: WAIT"
+
             self.locate_states(m)
             self.print_states(m)
             self.id_states(m)
             self.print_byte_states(m)
             self.spi_test_states(m, platform)
+            self.blit_states(m)
 
             with m.State("CURSOR_ON: RESET"):
                 m.d.sync += [
@@ -354,35 +406,19 @@ class OLED(Component):
 
             with m.State("CLSER: UNSTROBED"):
                 with m.If(~self._clser.busy):
-                    m.d.sync += [
-                        self._locator.row.eq(self._row),
-                        self._locator.col.eq(self._col),
-                        self._locator.stb.eq(1),
-                    ]
-                    m.next = "CLSER: STROBED LOCATOR"
-
-            with m.State("CLSER: STROBED LOCATOR"):
-                m.d.sync += self._locator.stb.eq(0)
-                m.next = "CLSER: UNSTROBED LOCATOR"
-
-            with m.State("CLSER: UNSTROBED LOCATOR"):
-                with m.If(~self._locator.busy):
                     m.d.sync += self.result.eq(OLED.Result.SUCCESS)
                     m.next = "IDLE"
 
             with m.State("INIT: STROBED ROM WRITER"):
-                m.d.sync += [
-                    self._rom_writer.stb.eq(0),
-                    self._scroller.rst.eq(0),
-                ]
+                m.d.sync += self._player.stb.eq(0)
                 m.next = "ROM WRITE SINGLE: UNSTROBED ROM WRITER"
 
             with m.State("ROM WRITE SINGLE: STROBED ROM WRITER"):
-                m.d.sync += self._rom_writer.stb.eq(0)
+                m.d.sync += self._player.stb.eq(0)
                 m.next = "ROM WRITE SINGLE: UNSTROBED ROM WRITER"
 
             with m.State("ROM WRITE SINGLE: UNSTROBED ROM WRITER"):
-                with m.If(~self._rom_writer.busy):
+                with m.If(~self._player.busy):
                     m.d.sync += self.result.eq(OLED.Result.SUCCESS)
                     m.next = "IDLE"
 
@@ -450,7 +486,11 @@ class OLED(Component):
                 # As is typical, zero-init ends up making the bitstream slightly
                 # larger than if we'd put actual data in it, so this is very
                 # much for Fun(tm).
-                self._rom_mem = Memory(width=16, depth=packed_size)
+                init = []
+                if platform.preload_rom:
+                    content = rom.ROM_CONTENT.ljust(packed_size * 2, b"\x00")
+                    init = list(struct.unpack(f"<{packed_size}H", content))
+                self._rom_mem = Memory(width=16, depth=packed_size, init=init)
                 m.submodules.rom_rd = rom_rd = self._rom_mem.read_port()
                 m.submodules.rom_wr = rom_wr = self._rom_mem.write_port(granularity=8)
                 m.d.comb += [
@@ -464,46 +504,50 @@ class OLED(Component):
     def elaborate_submodules(self, m: Module, platform: Platform):
         if Blackbox.I2C not in platform.blackboxes:
             connect(m, self.i2c_bus, self._i2c.bus)
+            connect(m, flipped(self.i2c_counters), self._i2c.counters)
 
         if Blackbox.SPIFR not in platform.blackboxes:
             connect(m, self._spifr.bus, self.spifr_bus)
 
         m.submodules.i2c = self._i2c
+        m.submodules.i2c_arbiter = arbiter = self._i2c_arbiter
         m.submodules.spifr = self._spifr
-        m.submodules.rom_writer = self._rom_writer
+        m.submodules.player = self._player
         m.submodules.locator = self._locator
         m.submodules.clser = self._clser
-        m.submodules.scroller = self._scroller
         m.submodules.cursor_c = self._cursor_c
 
         m.submodules.fifo_in = self.fifo_in
+        m.d.comb += [
+            self.fifo_in.w_data.eq(self.cmd_bus.w_data),
+            self.fifo_in.w_en.eq(self.cmd_bus.w_en),
+            self.cmd_bus.w_rdy.eq(self.fifo_in.w_rdy),
+            self.cmd_bus.w_level.eq(self.fifo_in.w_level),
+        ]
 
-        with m.If(self._rom_writer.busy):
-            connect(m, flipped(self.i2c_bus), self._rom_writer.i2c_bus)
-            connect(m, flipped(self.rom_bus), self._rom_writer.rom_bus)
-        with m.Elif(self._locator.busy):
-            connect(m, flipped(self.i2c_bus), self._locator.i2c_bus)
-        with m.Elif(self._clser.busy):
-            connect(m, flipped(self.i2c_bus), self._clser.i2c_bus)
-        with m.Elif(self._scroller.busy):
-            connect(m, flipped(self.i2c_bus), self._scroller.i2c_bus)
-            connect(m, flipped(self.rom_bus), self._scroller.rom_bus)
+        # In priority order; our own bus goes last, as the default.
+        engines = [self._player, self._locator, self._clser]
+        connect(m, flipped(self.i2c_bus), arbiter.bus)
+        for i, engine in enumerate(engines):
+            connect(m, arbiter.ports[i], engine.i2c_bus)
+            m.d.comb += arbiter.req[i].eq(engine.busy)
+        connect(m, arbiter.ports[len(engines)], self.own_i2c_bus)
+        # Anything we've left on the bus by the time we're back in IDLE is just
+        # finishing up; let the next command's engine queue in behind it.
+        m.d.comb += arbiter.release.eq(self._idle)
+
+        with m.If(self._player.busy):
+            connect(m, flipped(self.rom_bus), self._player.rom_bus)
         with m.Else():
-            connect(m, flipped(self.i2c_bus), self.own_i2c_bus)
             connect(m, flipped(self.rom_bus), self.own_rom_bus)
 
-        m.d.comb += self._locator.adjust.eq(self._scroller.adjusted)
+        m.d.comb += self._locator.adjust.eq(self._adjusted)
 
     def locate_states(self, m: Module):
         with m.State("LOCATE: ROW: WAIT"):
             with m.If(self.fifo_in.r_rdy):
                 with m.If(self.fifo_in.r_data != 0):
-                    m.d.sync += [
-                        self._row.eq(self.fifo_in.r_data),
-                        self._locator.row.eq(self.fifo_in.r_data),
-                    ]
-                with m.Else():
-                    m.d.sync += self._locator.row.eq(0)
+                    m.d.sync += self._row.eq(self.fifo_in.r_data)
                 m.d.sync += self.fifo_in.r_en.eq(1)
                 m.next = "LOCATE: ROW: STROBED R_EN"
 
@@ -514,29 +558,18 @@ class OLED(Component):
         with m.State("LOCATE: COL: WAIT"):
             with m.If(self.fifo_in.r_rdy):
                 with m.If(self.fifo_in.r_data != 0):
-                    m.d.sync += [
-                        self._col.eq(self.fifo_in.r_data),
-                        self._locator.col.eq(self.fifo_in.r_data),
-                    ]
-                with m.Else():
-                    m.d.sync += self._locator.col.eq(0)
-                m.d.sync += [
-                    self.fifo_in.r_en.eq(1),
-                    self._locator.stb.eq(1),
-                ]
+                    m.d.sync += self._col.eq(self.fifo_in.r_data)
+                m.d.sync += self.fifo_in.r_en.eq(1)
                 m.next = "LOCATE: COL: STROBED R_EN"
 
         with m.State("LOCATE: COL: STROBED R_EN"):
+            # Nothing goes on the bus until there's something to draw; see
+            # chpr_fsm.
             m.d.sync += [
                 self.fifo_in.r_en.eq(0),
-                self._locator.stb.eq(0),
+                self.result.eq(OLED.Result.SUCCESS),
             ]
-            m.next = "LOCATE: UNSTROBED LOCATOR"
-
-        with m.State("LOCATE: UNSTROBED LOCATOR"):
-            with m.If(~self._locator.busy):
-                m.d.sync += self.result.eq(OLED.Result.SUCCESS)
-                m.next = "IDLE"
+            m.next = "IDLE"
 
     def print_states(self, m: Module):
         remaining = Signal(8)
@@ -577,46 +610,71 @@ class OLED(Component):
                     m.next = "PRINT: DATA: WAIT"
 
     def chpr_fsm(self, m: Module):
-        with m.FSM():
+        # The panel's only located when a character's about to be drawn
+        # somewhere it isn't.  Page addressing mode only advances the column
+        # address, and on this panel that runs down the screen: a glyph at
+        # (row, col) leaves it at (row + 1, col), wrapping at the bottom.
+        with m.FSM(name="chpr"):
             with m.State("IDLE"):
                 with m.If(self._chpr_run):
                     with m.If(self._chpr_data == 13):
                         # CR
                         m.d.sync += [
                             self._col.eq(1),
-                            self._locator.col.eq(1),
-                            self._locator.row.eq(0),
-                            self._locator.stb.eq(1),
+                            self._chpr_run.eq(0),
                         ]
-                        m.next = "CHPR: STROBED LOCATOR"
                     with m.Elif(self._chpr_data == 10):
                         # LF
                         with m.If(self._row == 16):
                             m.d.sync += [
                                 self._col.eq(1),
-                                self._scroller.stb.eq(1),
+                                self._player.index.eq(rom.OFFSET_SCROLL),
+                                self._player.stb.eq(1),
                             ]
                             m.next = "CHPR: STROBED SCROLLER"
                         with m.Else():
                             m.d.sync += [
                                 self._col.eq(1),
                                 self._row.eq(self._row + 1),
-                                self._locator.row.eq(self._row + 1),
-                                self._locator.col.eq(1),
-                                self._locator.stb.eq(1),
+                                self._chpr_run.eq(0),
                             ]
-                            m.next = "CHPR: STROBED LOCATOR"
-                    with m.Else():
+                    with m.Elif(
+                        (self._panel_row == self._row) & (self._panel_col == self._col)
+                    ):
                         m.d.sync += [
-                            self._rom_writer.index.eq(
+                            self._player.index.eq(
                                 rom.OFFSET_CHAR + self._chpr_data
                             ),
-                            self._rom_writer.stb.eq(1),
+                            self._player.stb.eq(1),
                         ]
                         m.next = "CHPR: STROBED ROM WRITER"
+                    with m.Else():
+                        m.d.sync += [
+                            self._locator.row.eq(self._row),
+                            self._locator.col.eq(self._col),
+                            self._locator.stb.eq(1),
+                        ]
+                        m.next = "CHPR: STROBED LOCATOR"
+
+            with m.State("CHPR: STROBED LOCATOR"):
+                m.d.sync += self._locator.stb.eq(0)
+                m.next = "CHPR: UNSTROBED LOCATOR"
+
+            with m.State("CHPR: UNSTROBED LOCATOR"):
+                with m.If(~self._locator.busy):
+                    m.d.sync += [
+                        self._panel_row.eq(self._row),
+                        self._panel_col.eq(self._col),
+                        self._player.index.eq(rom.OFFSET_CHAR + self._chpr_data),
+                        self._player.stb.eq(1),
+                    ]
+                    m.next = "CHPR: STROBED ROM WRITER"
 
             with m.State("CHPR: STROBED ROM WRITER"):
-                m.d.sync += self._rom_writer.stb.eq(0)
+                m.d.sync += [
+                    self._player.stb.eq(0),
+                    self._panel_row.eq(Mux(self._row == 16, 1, self._row + 1)),
+                ]
                 with m.If(~self._chpr_advance):
                     m.d.sync += self._chpr_advance.eq(1)
                     m.next = "CHPR: UNSTROBED ROM WRITER"
@@ -635,39 +693,32 @@ class OLED(Component):
                     m.next = "CHPR: UNSTROBED ROM WRITER"
 
             with m.State("CHPR: UNSTROBED ROM WRITER"):
-                with m.If(~self._rom_writer.busy):
-                    m.d.sync += [
-                        self._locator.row.eq(self._row),
-                        self._locator.col.eq(self._col),
-                        self._locator.stb.eq(1),
-                    ]
-                    m.next = "CHPR: STROBED LOCATOR"
+                with m.If(~self._player.busy):
+                    with m.If(~self._player.ok):
+                        m.d.sync += self._panel_row.eq(0)
+                    m.d.sync += self._chpr_run.eq(0)
+                    m.next = "IDLE"
 
             with m.State("CHPR: UNSTROBED ROM WRITER, NEEDS SCROLL"):
-                with m.If(~self._rom_writer.busy):
-                    m.d.sync += self._scroller.stb.eq(1)
+                with m.If(~self._player.busy):
+                    m.d.sync += [
+                        self._player.index.eq(rom.OFFSET_SCROLL),
+                        self._player.stb.eq(1),
+                    ]
                     m.next = "CHPR: STROBED SCROLLER"
 
             with m.State("CHPR: STROBED SCROLLER"):
-                m.d.sync += self._scroller.stb.eq(0)
+                m.d.sync += self._player.stb.eq(0)
                 m.next = "CHPR: UNSTROBED SCROLLER"
 
             with m.State("CHPR: UNSTROBED SCROLLER"):
-                with m.If(~self._scroller.busy):
+                with m.If(~self._player.busy):
+                    with m.If(self._player.ok):
+                        m.d.sync += self._adjusted.eq(self._adjusted + 1)
                     m.d.sync += [
-                        self._locator.row.eq(self._row),
-                        self._locator.col.eq(self._col),
-                        self._locator.stb.eq(1),
+                        self._panel_row.eq(0),
+                        self._chpr_run.eq(0),
                     ]
-                    m.next = "CHPR: STROBED LOCATOR"
-
-            with m.State("CHPR: STROBED LOCATOR"):
-                m.d.sync += self._locator.stb.eq(0)
-                m.next = "CHPR: UNSTROBED LOCATOR"
-
-            with m.State("CHPR: UNSTROBED LOCATOR"):
-                with m.If(~self._locator.busy):
-                    m.d.sync += self._chpr_run.eq(0)
                     m.next = "IDLE"
 
     def id_states(self, m: Module):
@@ -900,3 +951,172 @@ class OLED(Component):
         with m.State("SPI_TEST: SECOND HALF: CHPR RUNNING"):
             with m.If(~self._chpr_run):
                 m.next = "SPI_TEST: WRITE LOOP"
+
+    def blit_states(self, m: Module):
+        # BLIT page col pages cols data..., FILL_RECT page col pages cols pattern.
+        #
+        # Each page is written in one transaction: the page and column are set
+        # with continued control bytes, then the rest is data.  The column
+        # auto-increments in page addressing mode (set by INIT), so the data
+        # goes straight through.
+        page = Signal(range(16))
+        col = Signal(range(128))
+        pages = Signal(range(17))
+        cols = Signal(range(129))
+        pattern = Signal(8)
+
+        arg = Signal(range(6))
+        page_left = Signal.like(pages)
+        col_left = Signal.like(cols)
+        header_ix = Signal(range(8))
+
+        fill = self._command == OLED.Command.FILL_RECT
+        transfer = Transfer(self.own_i2c_bus.in_fifo_w_data)
+        continued = C(ControlByte(True, "Command").to_byte(), 8)
+        header = Array(
+            [
+                continued,
+                Cmd.SetPageAddress(0).to_byte() | page,
+                continued,
+                Cmd.SetLowerColumnAddress(0).to_byte() | col[:4],
+                continued,
+                Cmd.SetHigherColumnAddress(0).to_byte() | col[4:],
+                C(ControlByte(False, "Data").to_byte(), 8),
+            ]
+        )
+
+        with m.State("BLIT: ARGS: WAIT"):
+            with m.If(self.fifo_in.r_rdy):
+                with m.Switch(arg):
+                    for i, target in enumerate([page, col, pages, cols, pattern]):
+                        with m.Case(i):
+                            m.d.sync += target.eq(self.fifo_in.r_data)
+                m.d.sync += [
+                    arg.eq(arg + 1),
+                    self.fifo_in.r_en.eq(1),
+                ]
+                m.next = "BLIT: ARGS: STROBED R_EN"
+
+        with m.State("BLIT: ARGS: STROBED R_EN"):
+            m.d.sync += self.fifo_in.r_en.eq(0)
+            with m.If(arg == Mux(fill, 5, 4)):
+                m.d.sync += arg.eq(0)
+                with m.If((pages == 0) | (cols == 0)):
+                    m.d.sync += self.result.eq(OLED.Result.SUCCESS)
+                    m.next = "IDLE"
+                with m.Else():
+                    m.d.sync += [
+                        page_left.eq(pages),
+                        col_left.eq(cols),
+                        header_ix.eq(0),
+                        transfer.kind.eq(Transfer.Kind.START),
+                        transfer.payload.start.addr.eq(self._addr),
+                        transfer.payload.start.rw.eq(RW.W),
+                        self.own_i2c_bus.in_fifo_w_en.eq(1),
+                    ]
+                    m.next = "BLIT: START: STROBED W_EN"
+            with m.Else():
+                m.next = "BLIT: ARGS: WAIT"
+
+        with m.State("BLIT: START: STROBED W_EN"):
+            m.d.sync += [
+                self.own_i2c_bus.in_fifo_w_en.eq(0),
+                self.own_i2c_bus.stb.eq(1),
+            ]
+            m.next = "BLIT: START: STROBED STB"
+
+        with m.State("BLIT: START: STROBED STB"):
+            m.d.sync += self.own_i2c_bus.stb.eq(0)
+            m.next = "BLIT: PAGE: UNSTROBED START"
+
+        with m.State("BLIT: PAGE: UNSTROBED START"):
+            with m.If(self.own_i2c_bus.in_fifo_w_rdy):
+                m.d.sync += [
+                    transfer.kind.eq(Transfer.Kind.DATA),
+                    transfer.payload.data.eq(header[0]),
+                    self.own_i2c_bus.in_fifo_w_en.eq(1),
+                    header_ix.eq(1),
+                ]
+                m.next = "BLIT: STROBED W_EN"
+
+        with m.State("BLIT: STROBED W_EN"):
+            m.d.sync += [
+                self.own_i2c_bus.in_fifo_w_en.eq(0),
+                self.fifo_in.r_en.eq(0),
+            ]
+            m.next = "BLIT: UNSTROBED W_EN"
+
+        with m.State("BLIT: UNSTROBED W_EN"):
+            with m.If(
+                self.own_i2c_bus.busy
+                & self.own_i2c_bus.ack
+                & self.own_i2c_bus.in_fifo_w_rdy
+            ):
+                with m.If(header_ix != len(header)):
+                    m.d.sync += [
+                        transfer.payload.data.eq(header[header_ix]),
+                        self.own_i2c_bus.in_fifo_w_en.eq(1),
+                        header_ix.eq(header_ix + 1),
+                    ]
+                    m.next = "BLIT: STROBED W_EN"
+                with m.Elif(col_left != 0):
+                    with m.If(fill):
+                        m.d.sync += [
+                            transfer.payload.data.eq(pattern),
+                            self.own_i2c_bus.in_fifo_w_en.eq(1),
+                            col_left.eq(col_left - 1),
+                        ]
+                        m.next = "BLIT: STROBED W_EN"
+                    with m.Elif(self.fifo_in.r_rdy):
+                        m.d.sync += [
+                            transfer.payload.data.eq(self.fifo_in.r_data),
+                            self.own_i2c_bus.in_fifo_w_en.eq(1),
+                            self.fifo_in.r_en.eq(1),
+                            col_left.eq(col_left - 1),
+                        ]
+                        m.next = "BLIT: STROBED W_EN"
+                with m.Elif(page_left != 1):
+                    # The next page's START goes in behind this page's last
+                    # byte, making it a repeated START.
+                    m.d.sync += [
+                        page.eq(page + 1),
+                        page_left.eq(page_left - 1),
+                        col_left.eq(cols),
+                        header_ix.eq(0),
+                        transfer.kind.eq(Transfer.Kind.START),
+                        transfer.payload.start.addr.eq(self._addr),
+                        transfer.payload.start.rw.eq(RW.W),
+                        self.own_i2c_bus.in_fifo_w_en.eq(1),
+                    ]
+                    m.next = "BLIT: NEXT PAGE: STROBED W_EN"
+                with m.Else():
+                    m.d.sync += self.result.eq(OLED.Result.SUCCESS)
+                    m.next = "IDLE"
+            with m.Elif(~self.own_i2c_bus.busy):
+                m.d.sync += self.result.eq(OLED.Result.FAILURE)
+                with m.If(fill):
+                    m.next = "IDLE"
+                with m.Else():
+                    m.next = "BLIT: FAILED: DRAIN"
+
+        with m.State("BLIT: NEXT PAGE: STROBED W_EN"):
+            m.d.sync += self.own_i2c_bus.in_fifo_w_en.eq(0)
+            m.next = "BLIT: PAGE: UNSTROBED START"
+
+        with m.State("BLIT: FAILED: DRAIN"):
+            # Whatever's left of the bitmap is still on its way; don't let it
+            # be taken for commands.
+            m.d.sync += self.fifo_in.r_en.eq(0)
+            with m.If(col_left == 0):
+                with m.If(page_left == 1):
+                    m.next = "IDLE"
+                with m.Else():
+                    m.d.sync += [
+                        page_left.eq(page_left - 1),
+                        col_left.eq(cols),
+                    ]
+            with m.Elif(self.fifo_in.r_rdy & ~self.fifo_in.r_en):
+                m.d.sync += [
+                    self.fifo_in.r_en.eq(1),
+                    col_left.eq(col_left - 1),
+                ]
@@ -0,0 +1,18 @@
+from amaranth.lib.wiring import In, Out, Signature
+
+__all__ = ["CommandBus"]
+
+
+# Streaming writer into OLED's command FIFO.  A producer presents a byte on
+# w_data and holds w_en high; the byte is accepted on any cycle where w_rdy is
+# also high, so a producer can push one byte per cycle for as long as there's
+# room.  w_level reports how many bytes are queued, for producers that need to
+# apply flow control further upstream (e.g. XON/XOFF over a serial link).
+CommandBus = Signature(
+    {
+        "w_data": Out(8),
+        "w_en": Out(1),
+        "w_rdy": In(1),
+        "w_level": In(16),
+    }
+)
@@ -136,8 +136,10 @@ class Locator(Component):
 
             with m.State("START: COL HIGHER: UNSTROBED W_EN"):
                 with m.If(
-                    ~self.i2c_bus.busy & self.i2c_bus.ack & self.i2c_bus.in_fifo_w_rdy
+                    self.i2c_bus.busy & self.i2c_bus.ack & self.i2c_bus.in_fifo_w_rdy
                 ):
+                    # The controller has our last byte; whoever's next can
+                    # queue up behind it.
                     m.d.sync += self.busy.eq(0)
                     m.next = "IDLE"
                 with m.Elif(~self.i2c_bus.busy):
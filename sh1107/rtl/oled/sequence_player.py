@@ -1,6 +1,7 @@
-from typing import cast
+from typing import Callable, NamedTuple, Sequence, cast
 
-from amaranth import Cat, Elaboratable, Module, Signal
+from amaranth import Cat, Elaboratable, Memory, Module, Signal, Value
+from amaranth.lib import data
 from amaranth.lib.wiring import Component, In, Out
 
 from ... import rom
@@ -8,11 +9,28 @@ from ...platform import Platform
 from ..i2c import RW, I2CBus, Transfer
 from .rom_bus import ROMBus
 
-__all__ = ["ROMWriter"]
+__all__ = ["SequencePlayer", "Patch"]
 
 
-class ROMWriter(Component):
+_IndexEntry = data.StructLayout({"offset": rom.ROM_ABITS, "len": rom.ROM_ABITS})
+
+
+class Patch(NamedTuple):
+    """
+    Replaces the byte written at position `at` while playing sequence `seq`
+    with `value(rom_byte)`.  Positions count data bytes only, from the start
+    of the sequence and across any breaks in it, like the offsets returned
+    by `Cmd.compose_with_offsets`.
+    """
+
+    seq: int
+    at: int
+    value: Callable[[Value], Value]
+
+
+class SequencePlayer(Component):
     _addr: int
+    _patches: list[Patch]
 
     index: Out(range(rom.SEQ_COUNT))
     stb: Out(1)
@@ -20,59 +38,57 @@ class ROMWriter(Component):
     rom_bus: Out(ROMBus(rom.ROM_ABITS, 8))
 
     busy: In(1)
+    ok: In(1)
 
+    _seq: Signal
     _offset: Signal
     _remain: Signal
+    _written: Signal
 
-    def __init__(self, *, addr: int):
+    def __init__(self, *, addr: int, patches: Sequence[Patch] = ()):
         super().__init__()
         self._addr = addr
+        self._patches = list(patches)
 
+        self._seq = Signal.like(self.index)
         self._offset = Signal(range(rom.ROM_LENGTH))
         self._remain = Signal(range(rom.ROM_LENGTH))
+        self._written = Signal(range(rom.ROM_LENGTH))
 
     def elaborate(self, platform: Platform) -> Elaboratable:
         m = Module()
 
         transfer = Transfer(self.i2c_bus.in_fifo_w_data)
 
+        # The index is known at build time, so rather than read each entry out
+        # of the ROM a byte at a time, we keep a copy we can read in one go.
+        m.submodules.index_rd = index_rd = Memory(
+            width=_IndexEntry.size,
+            depth=rom.SEQ_COUNT,
+            init=[
+                _IndexEntry.const({"offset": offset, "len": length}).as_bits()
+                for offset, length in rom.SEQ_INDEX
+            ],
+        ).read_port()
+        m.d.comb += index_rd.addr.eq(self.index)
+        index_entry = _IndexEntry(index_rd.data)
+
         with m.FSM():
             with m.State("IDLE"):
                 with m.If(self.stb):
                     m.d.sync += [
-                        self.rom_bus.addr.eq(self.index * 4),
+                        self._seq.eq(self.index),
+                        self._written.eq(0),
                         self.busy.eq(1),
+                        self.ok.eq(0),
                     ]
-                    m.next = "START: ADDRESSED OFFSET[0]"
-
-            with m.State("START: ADDRESSED OFFSET[0]"):
-                m.d.sync += self.rom_bus.addr.eq(self.rom_bus.addr + 1)
-                m.next = "START: ADDRESSED OFFSET[1], OFFSET[0] AVAILABLE"
+                    m.next = "START: INDEX AVAILABLE"
 
-            with m.State("START: ADDRESSED OFFSET[1], OFFSET[0] AVAILABLE"):
+            with m.State("START: INDEX AVAILABLE"):
                 m.d.sync += [
-                    self.rom_bus.addr.eq(self.rom_bus.addr + 1),
-                    self._offset.eq(self.rom_bus.data),
-                ]
-                m.next = "START: ADDRESSED LEN[0], OFFSET[1] AVAILABLE"
-
-            with m.State("START: ADDRESSED LEN[0], OFFSET[1] AVAILABLE"):
-                m.d.sync += [
-                    self.rom_bus.addr.eq(self.rom_bus.addr + 1),
-                    self._offset.eq(self._offset | self.rom_bus.data.shift_left(8)),
-                ]
-                m.next = "START: ADDRESSED LEN[1], LEN[0] AVAILABLE"
-
-            with m.State("START: ADDRESSED LEN[1], LEN[0] AVAILABLE"):
-                m.d.sync += [
-                    self._remain.eq(self.rom_bus.data),
-                    self.rom_bus.addr.eq(self._offset),
-                ]
-                m.next = "START: ADDRESSED *OFFSET, LEN[1] AVAILABLE"
-
-            with m.State("START: ADDRESSED *OFFSET, LEN[1] AVAILABLE"):
-                m.d.sync += [
-                    self._remain.eq(self._remain | self.rom_bus.data.shift_left(8)),
+                    self._offset.eq(index_entry.offset),
+                    self._remain.eq(index_entry.len),
+                    self.rom_bus.addr.eq(index_entry.offset),
                     transfer.kind.eq(Transfer.Kind.START),
                     transfer.payload.start.addr.eq(self._addr),
                     transfer.payload.start.rw.eq(RW.W),
@@ -104,6 +120,16 @@ class ROMWriter(Component):
                         self.i2c_bus.in_fifo_w_en.eq(1),
                     ]
 
+                    if self._patches:
+                        m.d.sync += self._written.eq(self._written + 1)
+                        for patch in self._patches:
+                            with m.If(
+                                (self._seq == patch.seq) & (self._written == patch.at)
+                            ):
+                                m.d.sync += transfer.payload.data.eq(
+                                    patch.value(self.rom_bus.data)
+                                )
+
                     # Prepare next read, whether it's data or NEXTLEN[0].
                     m.d.sync += self.rom_bus.addr.eq(self._offset + 1)
                     m.next = "SEND: LATCHED W_EN"
@@ -146,16 +172,26 @@ class ROMWriter(Component):
 
             with m.State("SEQ BREAK: LATCHED W_EN"):
                 m.d.sync += self.i2c_bus.in_fifo_w_en.eq(0)
-                m.next = "LOOP HEAD: SEQ BREAK OR WAIT I2C"
+                # Like any other byte, don't queue behind it if the last one
+                # was NACKed; the controller only discards one.
+                m.next = "SEND: WAIT FOR I2C"
 
             with m.State("FIN: WAIT I2C DONE"):
                 with m.If(
-                    ~self.i2c_bus.busy & self.i2c_bus.ack & self.i2c_bus.in_fifo_w_rdy
+                    self.i2c_bus.busy & self.i2c_bus.ack & self.i2c_bus.in_fifo_w_rdy
                 ):
-                    m.d.sync += self.busy.eq(0)
+                    # The controller has our last byte; whoever's next can
+                    # queue up behind it.
+                    m.d.sync += [
+                        self.busy.eq(0),
+                        self.ok.eq(1),
+                    ]
                     m.next = "IDLE"
                 with m.Elif(~self.i2c_bus.busy):
-                    m.d.sync += self.busy.eq(0)
+                    m.d.sync += [
+                        self.busy.eq(0),
+                        self.ok.eq(self.i2c_bus.ack),
+                    ]
                     m.next = "IDLE"
 
         return m
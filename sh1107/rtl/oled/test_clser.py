@@ -37,6 +37,7 @@ class TestClserTop(Elaboratable):
 
 
 class TestClser(sim.TestCase):
+    @sim_i2c.logged(lambda dut: dut.i2c)
     @sim.args(speed=Hz(100_000), ci_only=True)
     @sim.args(speed=Hz(400_000), ci_only=True)
     @sim.args(speed=Hz(2_000_000))
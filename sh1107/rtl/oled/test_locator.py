@@ -37,6 +37,7 @@ class TestLocatorTop(Elaboratable):
 
 
 class TestLocator(sim.TestCase):
+    @sim_i2c.logged(lambda dut: dut.i2c)
     @sim.i2c_speeds
     def test_sim_locator(self, dut: TestLocatorTop) -> sim.Procedure:
         def trigger() -> sim.Procedure:
@@ -58,6 +59,7 @@ class TestLocator(sim.TestCase):
             ],
         )
 
+    @sim_i2c.logged(lambda dut: dut.i2c)
     @sim.i2c_speeds
     def test_sim_locator_row_only(self, dut: TestLocatorTop) -> sim.Procedure:
         def trigger() -> sim.Procedure:
@@ -78,6 +80,7 @@ class TestLocator(sim.TestCase):
             ],
         )
 
+    @sim_i2c.logged(lambda dut: dut.i2c)
     @sim.i2c_speeds
     def test_sim_locator_col_only(self, dut: TestLocatorTop) -> sim.Procedure:
         def trigger() -> sim.Procedure:
@@ -0,0 +1,205 @@
+import numpy as np
+from amaranth.sim import Tick
+
+from ... import rom, sim
+from ...host import (compose_blit, encode_blit, encode_fill_rect, encode_locate,
+                     encode_print)
+from ...proto.model import SH1107
+from ...rom.chars import CHARS
+from ..common import Hz
+from . import OLED
+
+
+def _booted(dut: OLED) -> sim.Procedure:
+    # Out of reset, through the ROM copy if there is one.
+    while (yield dut.result) == OLED.Result.BUSY:
+        yield Tick()
+
+
+class TestOLED(sim.TestCase):
+    @sim.args(speed=Hz(2_000_000), fifo_depth=1, preload_rom=False)
+    @sim.args(speed=Hz(2_000_000), fifo_depth=8, preload_rom=False)
+    def test_sim_cmd_bus_stream(self, dut: OLED, fifo_depth: int) -> sim.Procedure:
+        # The OLED is busy copying the ROM at startup and doesn't touch its
+        # command FIFO, so a producer should get exactly fifo_depth bytes in,
+        # one per cycle, before being told to wait.
+        assert (yield dut.result) == OLED.Result.BUSY
+
+        yield dut.cmd_bus.w_en.eq(1)
+        for i in range(fifo_depth):
+            yield dut.cmd_bus.w_data.eq(OLED.Command.NOP)
+            assert (yield dut.cmd_bus.w_rdy), f"not ready after {i} bytes"
+            yield Tick()
+        assert not (yield dut.cmd_bus.w_rdy)
+        assert (yield dut.cmd_bus.w_level) == fifo_depth
+
+        yield dut.cmd_bus.w_en.eq(0)
+        yield Tick()
+        assert (yield dut.cmd_bus.w_level) == fifo_depth
+        assert (yield dut.result) == OLED.Result.BUSY
+
+        # Once up, the queued NOPs drain.
+        while (yield dut.result) == OLED.Result.BUSY:
+            yield Tick()
+        for _ in range(4 * fifo_depth):
+            yield Tick()
+        assert (yield dut.cmd_bus.w_level) == 0
+        assert (yield dut.result) == OLED.Result.SUCCESS
+
+    def _run_command(
+        self, dut: OLED, command: bytes, *, ack: bool = True
+    ) -> sim.Generator[list[int]]:
+        in_fifo = dut._i2c._in_fifo
+        written: list[int] = []
+
+        def step() -> sim.Procedure:
+            yield Tick()
+            if (yield in_fifo.r_en) and (yield in_fifo.r_rdy):
+                written.append((yield in_fifo.r_data))
+
+        # The display ACKs everything, or nothing.
+        yield dut._i2c.hw_bus.sda_i.eq(not ack)
+        while (yield dut.result) == OLED.Result.BUSY:
+            yield Tick()
+
+        yield dut.cmd_bus.w_en.eq(1)
+        for b in command:
+            yield dut.cmd_bus.w_data.eq(b)
+            assert (yield dut.cmd_bus.w_rdy)
+            yield from step()
+        yield dut.cmd_bus.w_en.eq(0)
+        yield from step()
+
+        while not (yield dut._idle) or (yield dut._i2c.bus.busy):
+            yield from step()
+        assert (yield dut.result) == (
+            OLED.Result.SUCCESS if ack else OLED.Result.FAILURE
+        )
+        assert (yield dut.cmd_bus.w_level) == 0
+
+        return written
+
+    @staticmethod
+    def _expected_blit(page: int, col: int, rows: list[bytes]) -> list[int]:
+        start = 0x100 | (OLED.ADDR << 1)
+        return [
+            b
+            for transaction in compose_blit(page, col, rows)
+            for b in [start, *transaction]
+        ]
+
+    @sim.snapshot(_booted)
+    @sim.args(speed=Hz(2_000_000))
+    def test_sim_blit(self, dut: OLED) -> sim.Procedure:
+        rows = [bytes(range(0x10, 0x15)), bytes(range(0xA0, 0xA5))]
+        written = yield from self._run_command(dut, encode_blit(14, 0x3E, rows))
+        self.assertEqual(self._expected_blit(14, 0x3E, rows), written)
+
+    @sim.snapshot(_booted)
+    @sim.args(speed=Hz(2_000_000))
+    def test_sim_fill_rect(self, dut: OLED) -> sim.Procedure:
+        written = yield from self._run_command(
+            dut, encode_fill_rect(3, 0x71, 3, 4, 0x5A)
+        )
+        self.assertEqual(
+            self._expected_blit(3, 0x71, [bytes([0x5A] * 4)] * 3), written
+        )
+
+    @sim.snapshot(_booted)
+    @sim.args(speed=Hz(2_000_000))
+    def test_sim_blit_nack(self, dut: OLED) -> sim.Procedure:
+        # What's left of the bitmap once the display stops answering isn't run
+        # as commands.
+        rows = [bytes([OLED.Command.INIT] * 8)] * 2
+        written = yield from self._run_command(
+            dut, encode_blit(0, 0, rows), ack=False
+        )
+        self.assertEqual(0x100 | (OLED.ADDR << 1), written[0])
+        self.assertEqual(OLED.Command.BLIT, (yield dut._command))
+
+    @sim.snapshot(_booted)
+    @sim.args(speed=Hz(2_000_000))
+    def test_sim_print(self, dut: OLED) -> sim.Procedure:
+        # The panel's only located when a character's going somewhere it isn't.
+        # LOCATE, CR and LF don't touch the bus, and D lands where C's glyph
+        # left the column address.
+        command = encode_locate(3, 14) + encode_print("AB\r\nC\r\nD")
+        written = yield from self._run_command(dut, command)
+
+        start = 0x100 | (OLED.ADDR << 1)
+        starts = [i for i, b in enumerate(written) if b == start]
+        self.assertEqual(7, len(starts))
+
+        sh1107 = SH1107()
+        for transaction in rom.INIT_SEQUENCE + rom.DISPLAY_ON_SEQUENCE:
+            sh1107.write(transaction)
+        for i, j in zip(starts, starts[1:] + [len(written)]):
+            sh1107.write(written[i + 1 : j])
+
+        image = sh1107.image()
+        lit = 0
+        for c, row, col in [("A", 3, 14), ("B", 3, 15), ("C", 4, 1), ("D", 5, 1)]:
+            rows = np.frombuffer(CHARS[ord(c)], dtype=np.uint8)
+            glyph = np.unpackbits(rows[:, None], axis=1)
+            np.testing.assert_array_equal(
+                glyph, image[(row - 1) * 8 : row * 8, (col - 1) * 8 : col * 8], c
+            )
+            lit += glyph.sum()
+        self.assertEqual(lit, image.sum())
+
+    @sim.snapshot(_booted)
+    @sim.args(speed=Hz(2_000_000))
+    def test_sim_print_keeps_bus_busy(self, dut: OLED) -> sim.Procedure:
+        # Glyph ROM reads, and the next character's locate, queue up behind
+        # the byte on the bus; once a PRINT starts transmitting, the bus
+        # isn't left idle until it's done.
+        yield dut._i2c.hw_bus.sda_i.eq(0)
+        yield dut.cmd_bus.w_en.eq(1)
+        for b in encode_print("0123456789\r\nabcdef"):
+            yield dut.cmd_bus.w_data.eq(b)
+            yield Tick()
+        yield dut.cmd_bus.w_en.eq(0)
+
+        while not (yield dut._i2c.bus.busy):
+            yield Tick()
+        idle = 0
+        while not (yield dut._idle) or (yield dut._i2c.bus.busy):
+            if not (yield dut._i2c.bus.busy):
+                idle += 1
+            yield Tick()
+        self.assertEqual(0, idle)
+
+    @sim.snapshot(_booted)
+    @sim.args(speed=Hz(2_000_000))
+    def test_sim_commands_keep_bus_busy(self, dut: OLED) -> sim.Procedure:
+        # Each command is decoded while the last one's final byte is still on
+        # the bus, and its first transaction queued in behind it, whichever
+        # engine either of them used.
+        stream = (
+            bytes([OLED.Command.DISPLAY_OFF, OLED.Command.DISPLAY_ON])
+            + encode_locate(2, 2)
+            + encode_print("ab")
+            + encode_fill_rect(1, 2, 1, 3, 0xFF)
+            + encode_print("c")
+            + encode_blit(3, 4, [b"\x01\x02"])
+            + bytes([OLED.Command.CURSOR_ON, OLED.Command.CURSOR_OFF])
+        )
+        yield dut._i2c.hw_bus.sda_i.eq(0)
+        yield dut.cmd_bus.w_en.eq(1)
+        for b in stream:
+            yield dut.cmd_bus.w_data.eq(b)
+            yield Tick()
+        yield dut.cmd_bus.w_en.eq(0)
+
+        while not (yield dut._i2c.bus.busy):
+            yield Tick()
+        idle = 0
+        while (
+            not (yield dut._idle)
+            or (yield dut._i2c.bus.busy)
+            or (yield dut.cmd_bus.w_level)
+        ):
+            if not (yield dut._i2c.bus.busy):
+                idle += 1
+            yield Tick()
+        self.assertEqual(0, idle)
@@ -0,0 +1,136 @@
+from typing import Final
+
+from amaranth import Elaboratable, Memory, Module, Signal
+from amaranth.hdl import ReadPort
+from amaranth.lib.wiring import connect
+from amaranth.sim import Delay
+
+from ... import rom, sim
+from ...platform import Platform
+from ..common import Hz
+from ..i2c import I2C, sim_i2c
+from .rom_bus import ROMBus
+from .scroller import scroll_patches
+from .sequence_player import SequencePlayer
+
+
+class TestSequencePlayerTop(Elaboratable):
+    ADDR: Final[int] = 0x3D
+
+    speed: Hz
+
+    i2c: I2C
+    rom_rd: ReadPort
+    adjusted: Signal
+    player: SequencePlayer
+
+    def __init__(self, *, speed: Hz):
+        self.speed = speed
+
+        self.i2c = I2C(speed=speed)
+        self.rom_rd = Memory(
+            width=8,
+            depth=rom.ROM_LENGTH,
+            init=rom.ROM_CONTENT,
+        ).read_port()
+        self.adjusted = Signal(range(16))
+        self.player = SequencePlayer(
+            addr=TestSequencePlayerTop.ADDR,
+            patches=scroll_patches(self.adjusted),
+        )
+
+    def elaborate(self, platform: Platform) -> Elaboratable:
+        m = Module()
+
+        m.submodules.i2c = self.i2c
+        m.submodules.rom_rd = self.rom_rd
+        m.submodules.player = self.player
+
+        connect(m, self.i2c.bus, self.player.i2c_bus)
+        ROMBus.connect_read_port(m, self.rom_rd, self.player.rom_bus)
+
+        return m
+
+
+class TestSequencePlayer(sim.TestCase):
+    def _trigger(self, dut: TestSequencePlayerTop, index: int) -> sim.Procedure:
+        assert not (yield dut.player.busy)
+        yield dut.player.index.eq(index)
+        yield dut.player.stb.eq(1)
+        yield Delay(sim.clock())
+        yield dut.player.stb.eq(0)
+
+    @sim_i2c.logged(lambda dut: dut.i2c)
+    @sim.i2c_speeds
+    def test_sim_sequence_player_dispoff(
+        self, dut: TestSequencePlayerTop
+    ) -> sim.Procedure:
+        yield from sim_i2c.full_sequence(
+            dut.i2c,
+            lambda: self._trigger(dut, rom.OFFSET_DISPLAY_OFF),
+            [
+                0x17A,
+                0x00,
+                0xAE,
+            ],
+        )
+
+    @sim_i2c.logged(lambda dut: dut.i2c)
+    @sim.i2c_speeds
+    def test_sim_sequence_player_chara(
+        self, dut: TestSequencePlayerTop
+    ) -> sim.Procedure:
+        yield from sim_i2c.full_sequence(
+            dut.i2c,
+            lambda: self._trigger(dut, rom.OFFSET_CHAR + 0x41),
+            [
+                0x17A,
+                0x40,
+                0b00110000,
+                0b01111000,
+                0b11001100,
+                0b11001100,
+                0b11111100,
+                0b11001100,
+                0b11001100,
+                0b00000000,
+            ],
+        )
+
+    @sim_i2c.logged(lambda dut: dut.i2c)
+    @sim.args(speed=Hz(100_000), ci_only=True)
+    @sim.args(speed=Hz(400_000), ci_only=True)
+    @sim.args(speed=Hz(2_000_000))
+    def test_sim_sequence_player_scroll(
+        self, dut: TestSequencePlayerTop
+    ) -> sim.Procedure:
+        yield dut.adjusted.eq(3)
+
+        yield from sim_i2c.full_sequence(
+            dut.i2c,
+            lambda: self._trigger(dut, rom.OFFSET_SCROLL),
+            [
+                0x17A,
+                0x00,
+                0x21,
+                0xB0,
+                0x11,
+            ]
+            + [
+                [
+                    0x17A,
+                    0x80,
+                    0x08 + i,
+                    0x40,
+                ]
+                + [0x00] * 16
+                for i in range(8)
+            ]
+            + [
+                0x17A,
+                0x00,
+                0x20,
+                0xDC,
+                0x20,
+            ],
+        )
@@ -0,0 +1,92 @@
+from amaranth import Cat, Elaboratable, Memory, Module, Signal
+from amaranth.lib.wiring import Component, In
+
+from ...platform import Platform
+from . import SPIHardwareBus
+
+__all__ = ["SPIFlashPeripheral"]
+
+
+class SPIFlashPeripheral(Component):
+    """
+    Simulation model of just enough of a SPI flash for SPIFlashReader: release
+    from power-down (0xAB), then read (0x03) from base onwards out of data.
+    """
+
+    _data: bytes
+    _base: int
+
+    spi: In(SPIHardwareBus)
+
+    def __init__(self, *, data: bytes, base: int):
+        super().__init__()
+        self._data = data
+        self._base = base
+
+    def elaborate(self, platform: Platform) -> Elaboratable:
+        m = Module()
+
+        m.submodules.rd = rd = Memory(
+            width=8, depth=len(self._data), init=self._data
+        ).read_port(domain="comb")
+
+        sr = Signal(32)
+        edges = Signal(range(33))
+        addr = Signal(24)
+        bit = Signal(range(8))
+
+        # As with the mock in test_spi, everything runs off the one clock, so
+        # SPI clk is high for the back half of every cycle CS is.
+        clk_rising = self.spi.clk == 1
+
+        srnext = Signal.like(sr)
+        m.d.comb += [
+            srnext.eq(Cat(self.spi.copi, sr[:-1])),
+            rd.addr.eq(addr - self._base),
+            self.spi.cipo.eq(0),
+        ]
+
+        with m.If(self.spi.cs & clk_rising):
+            m.d.sync += [
+                sr.eq(srnext),
+                edges.eq(edges + 1),
+            ]
+        with m.Else():
+            m.d.sync += edges.eq(0)
+
+        with m.FSM():
+            with m.State("IDLE"):
+                with m.If(self.spi.cs):
+                    m.next = "SELECTED, POWERED DOWN"
+
+            with m.State("SELECTED, POWERED DOWN"):
+                with m.If((edges == 7) & (srnext[:8] == 0xAB)):
+                    m.next = "SELECTED, POWERING UP, NEEDS DESELECT"
+
+            with m.State("SELECTED, POWERING UP, NEEDS DESELECT"):
+                with m.If(~self.spi.cs):
+                    m.next = "DESELECTED, POWERED UP"
+
+            with m.State("DESELECTED, POWERED UP"):
+                with m.If(self.spi.cs):
+                    m.next = "SELECTED, POWERED UP"
+
+            with m.State("SELECTED, POWERED UP"):
+                with m.If((edges == 31) & (srnext[24:] == 0x03)):
+                    m.d.sync += [
+                        addr.eq(srnext[:24]),
+                        bit.eq(0),
+                    ]
+                    m.next = "READING"
+                with m.Elif(~self.spi.cs):
+                    m.next = "DESELECTED, POWERED UP"
+
+            with m.State("READING"):
+                m.d.comb += self.spi.cipo.eq(rd.data.bit_select((7 - bit)[:3], 1))
+                m.d.sync += bit.eq(bit + 1)
+                with m.If(bit == 7):
+                    m.d.sync += addr.eq(addr + 1)
+                with m.If(~self.spi.cs):
+                    m.next = "IDLE"
+
+        return m
@@ -7,6 +7,7 @@ from amaranth.sim import Tick
 from ... import sim
 from ...platform import Platform
 from . import SPIFlashReader, SPIHardwareBus
+from .sim_spi import SPIFlashPeripheral
 
 
 # TODO(Ch): try using this + initted Memory in vsh instead of the whitebox, just
@@ -147,6 +148,22 @@ class TestSPIFlashReaderTop(Component):
         return m
 
 
+class TestSPIFlashPeripheralTop(TestSPIFlashReaderTop):
+    _peripheral: SPIFlashPeripheral
+
+    def __init__(self, *, data: bytes):
+        Component.__init__(self)
+
+        self._len = len(data)
+
+        self._fifo_out = SyncFIFO(width=8, depth=self._len)
+
+        self._spifr = SPIFlashReader()
+        self._peripheral = SPIFlashPeripheral(
+            data=b"\xff" * 4 + data, base=Platform["test"].flash_rom_base - 4
+        )
+
+
 class TestSPIFlashReader(sim.TestCase):
     @sim.args(data=C(0x3C, 8))
     @sim.args(data=C(0x0101, 16))
@@ -165,3 +182,17 @@ class TestSPIFlashReader(sim.TestCase):
         for i in reversed(range(len(data) // 8)):
             expected.append((yield data[i * 8 : (i + 1) * 8]))
         self.assertEqual((yield from sim.fifo_content(dut._fifo_out)), expected)
+
+    @sim.args(data=bytes(range(0x3C, 0x5C)))
+    def test_sim_spifr_peripheral(
+        self, dut: TestSPIFlashPeripheralTop, data: bytes
+    ) -> sim.Procedure:
+        yield dut.stb.eq(1)
+        yield Tick()
+        yield dut.stb.eq(0)
+        yield Tick()
+
+        while (yield dut.busy):
+            yield Tick()
+
+        self.assertEqual((yield from sim.fifo_content(dut._fifo_out)), list(data))
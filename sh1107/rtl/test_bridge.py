@@ -0,0 +1,85 @@
+from typing import cast
+
+from amaranth.sim import Tick
+
+from .. import sim
+from ..platform import Platform
+from .bridge import Top
+from .common import Hz
+from .oled import OLED
+
+BAUD = 1_000_000
+
+
+class _Host:
+    """
+    Both ends of the host's side of the serial line, one clock at a time:
+    sends queued bytes 8N1 while not paused, and decodes what comes back,
+    pausing on XOFF and resuming on XON like a host with IXON would.
+    """
+
+    def __init__(self, bit_ticks: int, to_send: list[int]):
+        self.bit_ticks = bit_ticks
+        self.to_send = to_send
+        self.received: list[int] = []
+        self.paused = False
+
+        self._rx_bits: list[int] = []
+        self._rx_countdown = 0
+        self._tx_bits: list[int] = []
+        self._tx_countdown = 0
+
+    def step(self, tx: int) -> int:
+        if self._rx_countdown:
+            self._rx_countdown -= 1
+        elif self._rx_bits:
+            self._rx_bits.append(tx)
+            if len(self._rx_bits) == 10:
+                assert self._rx_bits[0] == 0 and self._rx_bits[9] == 1
+                byte = sum(b << i for i, b in enumerate(self._rx_bits[1:9]))
+                self.received.append(byte)
+                if byte == Top.XOFF:
+                    self.paused = True
+                elif byte == Top.XON:
+                    self.paused = False
+                self._rx_bits = []
+            else:
+                self._rx_countdown = self.bit_ticks - 1
+        elif not tx:
+            # Sample mid-bit from here on.
+            self._rx_bits.append(0)
+            self._rx_countdown = self.bit_ticks + self.bit_ticks // 2 - 1
+
+        if not self._tx_countdown:
+            if self._tx_bits:
+                self._tx_bits.pop(0)
+            elif self.to_send and not self.paused:
+                byte = self.to_send.pop(0)
+                self._tx_bits = [0, *((byte >> i) & 1 for i in range(8)), 1]
+            self._tx_countdown = self.bit_ticks
+        self._tx_countdown -= 1
+
+        return self._tx_bits[0] if self._tx_bits else 1
+
+
+class TestBridge(sim.TestCase):
+    @sim.args(speed=Hz(2_000_000), baud=BAUD, preload_rom=False)
+    def test_sim_flow_control(self, dut: Top) -> sim.Procedure:
+        bit_ticks = cast(int, Platform["test"].default_clk_frequency) // BAUD
+
+        # The OLED doesn't look at its FIFO until it's done copying the ROM at
+        # startup, so a stream of NOPs at line rate gets paused by XOFF, and
+        # resumed by XON once the OLED catches up.
+        host = _Host(bit_ticks, [OLED.Command.NOP] * (Top.HIGH_WATER + 32))
+        cmd_bus = dut._oled.cmd_bus
+
+        max_level = 0
+        while host.to_send or host.paused or (yield cmd_bus.w_level):
+            yield dut.rx.eq(host.step((yield dut.tx)))
+            yield Tick()
+            max_level = max(max_level, (yield cmd_bus.w_level))
+
+        self.assertEqual([Top.XOFF, Top.XON], host.received)
+        assert Top.HIGH_WATER <= max_level < Top.FIFO_DEPTH
+        assert not (yield dut.overrun)
+        assert not (yield dut.stopped)
@@ -0,0 +1,148 @@
+from typing import Final
+
+from amaranth import Cat, Elaboratable, Module, Signal
+from amaranth.lib.wiring import Component, In, Out
+
+from ...platform import Platform
+from ..common import Counter
+
+__all__ = ["UARTRx", "UARTTx"]
+
+
+class UARTRx(Component):
+    """
+    8N1 receiver.
+
+    valid strobes for one cycle with the received byte on data.  A byte whose
+    stop bit doesn't read high is dropped, strobing ferr instead.
+    """
+
+    DEFAULT_BAUD: Final[int] = 115_200
+
+    _baud: int
+
+    rx: Out(1, init=1)
+
+    data: In(8)
+    valid: In(1)
+    ferr: In(1)
+
+    def __init__(self, *, baud: int = DEFAULT_BAUD):
+        super().__init__()
+        self._baud = baud
+
+    def elaborate(self, platform: Platform) -> Elaboratable:
+        m = Module()
+
+        m.submodules.c = c = Counter(hz=self._baud)
+
+        rx_meta = Signal(init=1)
+        rx = Signal(init=1)
+        m.d.sync += [
+            rx_meta.eq(self.rx),
+            rx.eq(rx_meta),
+        ]
+
+        shreg = Signal(8)
+        bit = Signal(range(8))
+
+        m.d.sync += [
+            self.valid.eq(0),
+            self.ferr.eq(0),
+        ]
+
+        # The counter starts on the falling edge of the start bit, so half
+        # strobes in the middle of each bit period thereafter.
+        with m.FSM():
+            with m.State("IDLE"):
+                with m.If(~rx):
+                    m.next = "START"
+
+            with m.State("START"):
+                m.d.comb += c.en.eq(1)
+                with m.If(c.half):
+                    with m.If(rx):
+                        m.next = "IDLE"
+                    with m.Else():
+                        m.d.sync += bit.eq(0)
+                        m.next = "DATA"
+
+            with m.State("DATA"):
+                m.d.comb += c.en.eq(1)
+                with m.If(c.half):
+                    m.d.sync += [
+                        shreg.eq(Cat(shreg[1:], rx)),
+                        bit.eq(bit + 1),
+                    ]
+                    with m.If(bit == 7):
+                        m.next = "STOP"
+
+            with m.State("STOP"):
+                m.d.comb += c.en.eq(1)
+                with m.If(c.half):
+                    with m.If(rx):
+                        m.d.sync += [
+                            self.data.eq(shreg),
+                            self.valid.eq(1),
+                        ]
+                    with m.Else():
+                        m.d.sync += self.ferr.eq(1)
+                    m.next = "IDLE"
+
+        return m
+
+
+class UARTTx(Component):
+    """
+    8N1 transmitter.
+
+    Strobe stb with a byte on data while busy is low; busy rises on the next
+    cycle and falls once the stop bit has been sent.
+    """
+
+    DEFAULT_BAUD: Final[int] = 115_200
+
+    _baud: int
+
+    data: Out(8)
+    stb: Out(1)
+
+    busy: In(1)
+    tx: In(1, init=1)
+
+    def __init__(self, *, baud: int = DEFAULT_BAUD):
+        super().__init__()
+        self._baud = baud
+
+    def elaborate(self, platform: Platform) -> Elaboratable:
+        m = Module()
+
+        m.submodules.c = c = Counter(hz=self._baud)
+
+        shreg = Signal(10)
+        remain = Signal(range(11))
+
+        with m.FSM():
+            with m.State("IDLE"):
+                m.d.sync += self.tx.eq(1)
+                with m.If(self.stb):
+                    m.d.sync += [
+                        shreg.eq(Cat(0, self.data, 1)),
+                        remain.eq(10),
+                        self.busy.eq(1),
+                    ]
+                    m.next = "SEND"
+
+            with m.State("SEND"):
+                m.d.comb += c.en.eq(1)
+                m.d.sync += self.tx.eq(shreg[0])
+                with m.If(c.full):
+                    m.d.sync += [
+                        shreg.eq(shreg >> 1),
+                        remain.eq(remain - 1),
+                    ]
+                    with m.If(remain == 1):
+                        m.d.sync += self.busy.eq(0)
+                        m.next = "IDLE"
+
+        return m
@@ -0,0 +1,70 @@
+from typing import cast
+
+from amaranth.sim import Tick
+
+from ... import sim
+from ...platform import Platform
+from . import UARTRx, UARTTx
+
+BAUD = 1_000_000
+
+
+def _bit_ticks() -> int:
+    return cast(int, Platform["test"].default_clk_frequency) // BAUD
+
+
+def send_byte(
+    dut: UARTRx, byte: int, *, stop: int = 1
+) -> sim.Generator[list[int | None]]:
+    """
+    Bit-bang a byte into dut, then idle for a bit period.  Returns what was
+    received: a byte for each valid strobe, None for each ferr strobe.
+    """
+    received: list[int | None] = []
+    for bit in [0, *((byte >> i) & 1 for i in range(8)), stop, 1]:
+        yield dut.rx.eq(bit)
+        for _ in range(_bit_ticks()):
+            if (yield dut.valid):
+                received.append((yield dut.data))
+            if (yield dut.ferr):
+                received.append(None)
+            yield Tick()
+    return received
+
+
+class TestUART(sim.TestCase):
+    @sim.args(baud=BAUD)
+    def test_sim_rx(self, dut: UARTRx) -> sim.Procedure:
+        received: list[int | None] = []
+        for byte in [0x55, 0x00, 0xFF, 0xA3]:
+            received += yield from send_byte(dut, byte)
+        self.assertEqual([0x55, 0x00, 0xFF, 0xA3], received)
+
+    @sim.args(baud=BAUD)
+    def test_sim_rx_framing_error(self, dut: UARTRx) -> sim.Procedure:
+        received = yield from send_byte(dut, 0x42, stop=0)
+        self.assertEqual([None], received)
+
+    @sim.args(baud=BAUD)
+    def test_sim_tx(self, dut: UARTTx) -> sim.Procedure:
+        assert (yield dut.tx)
+        assert not (yield dut.busy)
+
+        yield dut.data.eq(0xA3)
+        yield dut.stb.eq(1)
+        yield Tick()
+        yield dut.stb.eq(0)
+        yield Tick()
+        assert (yield dut.busy)
+
+        # Sample in the middle of each bit period.
+        for _ in range(_bit_ticks() // 2):
+            yield Tick()
+        bits: list[int] = []
+        for _ in range(10):
+            bits.append((yield dut.tx))
+            for _ in range(_bit_ticks()):
+                yield Tick()
+
+        self.assertEqual([0, 1, 1, 0, 0, 0, 1, 0, 1, 1], bits)
+        assert not (yield dut.busy)
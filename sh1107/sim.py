@@ -7,8 +7,9 @@ from contextlib import contextmanager
 from typing import Any, Callable, Iterator, Optional, Self, Tuple
 
 from amaranth import Elaboratable, Record, Signal
-from amaranth.hdl import Fragment
-from amaranth.hdl.ast import Operator, Statement
+from amaranth.hdl import (DriverConflict, Fragment, MemoryData, MemoryInstance,
+                          Value, ValueCastable)
+from amaranth.hdl.ast import Assign, Operator, Statement
 from amaranth.lib.fifo import SyncFIFO
 from amaranth.sim import Delay, Simulator, Tick
 
@@ -17,11 +18,15 @@ from .platform import Platform
 
 __all__ = [
     "clock",
+    "Changed",
     "Procedure",
     "TestCase",
     "args",
     "i2c_speeds",
     "always_args",
+    "processes",
+    "snapshot",
+    "Snapshot",
     "fifo_content",
 ]
 
@@ -47,7 +52,24 @@ def override_clock(new_clock: Optional[float]) -> Iterator[None]:
         _active_clock = old_sim_clock
 
 
-ValueLike: typing.TypeAlias = Signal | Record | Delay | Statement | Operator | Tick
+class Changed:
+    """
+    Yielded from a sim test: wait until any of signals changes, rather than
+    polling them.  With a timeout, give up after that many seconds.  Sends
+    back whether anything changed.
+    """
+
+    signals: tuple[Signal, ...]
+    timeout: Optional[float]
+
+    def __init__(self, *signals: Signal, timeout: Optional[float] = None):
+        self.signals = signals
+        self.timeout = timeout
+
+
+ValueLike: typing.TypeAlias = (
+    Signal | Record | Delay | Statement | Operator | Tick | Changed
+)
 
 T = typing.TypeVar("T")
 Generator = typing.Generator[ValueLike, bool | int, T]
@@ -84,8 +106,6 @@ class TestCase(unittest.TestCase):
 
         pattern = re.compile(r"[\W_]+")
 
-        platform = Platform["test"]
-
         def sim_args_into_str(sim_args: SimArgs) -> str:
             subbed = pattern.sub("_", "_".join(str(v) for v in sim_args))
             return subbed.removesuffix("_").removeprefix("_")
@@ -93,6 +113,11 @@ class TestCase(unittest.TestCase):
         for sim_args in all_sim_args:
             expected_failure = sim_args[1].pop("expected_failure", False)
             ci_only = sim_args[1].pop("ci_only", False)
+            preload_rom = sim_args[1].pop("preload_rom", None)
+
+            platform = Platform["test"]
+            if preload_rom is not None:
+                platform.preload_rom = preload_rom
 
             suffix = sim_args_into_str(sim_args)
             if len(all_sim_args) > 1 and suffix:
@@ -110,7 +135,9 @@ class TestCase(unittest.TestCase):
                 sim_args = (args + sim_args[0], {**kwargs, **sim_args[1]})
 
             @override_clock(getattr(cls, "SIM_CLOCK", None))
-            def wrapper(self: TestCase, target: str, sim_args: SimArgs):
+            def wrapper(
+                self: TestCase, target: str, sim_args: SimArgs, platform: Platform
+            ):
                 dutc_args, dutc_kwargs = sim_args
                 dut = dutc(*dutc_args, **dutc_kwargs)
 
@@ -124,7 +151,21 @@ class TestCase(unittest.TestCase):
 
                 sim = Simulator(Fragment.get(dut, platform))
                 sim.add_clock(clock())
-                sim.add_testbench(bench)
+                for factory in getattr(sim_test, "_sim_processes", []):
+                    for process in factory(dut):
+                        sim.add_process(process)
+                boot = getattr(sim_test, "_sim_boot", None)
+                if boot is None:
+                    sim.add_testbench(_testbench(bench))
+                else:
+                    # Tests of one configuration share what boot leaves behind.
+                    config = sorted(
+                        (k, repr(v)) for k, v in dutc_kwargs.items() if k != "platform"
+                    )
+                    key = (dutc, repr(config), platform.preload_rom, clock(), boot)
+                    sim.add_testbench(
+                        _booted_testbench(bench, lambda: boot(dut), sim._design, key)
+                    )
 
                 vcd_path = path(f"build/{cls.__name__}.{target}.vcd")
                 sim_exc = None
@@ -142,8 +183,9 @@ class TestCase(unittest.TestCase):
                 self: TestCase,
                 target: str = target,
                 sim_args: SimArgs = sim_args,
+                platform: Platform = platform,
             ):
-                return wrapper(self, target, sim_args)
+                return wrapper(self, target, sim_args, platform)
 
             if expected_failure:
                 proxy = unittest.expectedFailure(proxy)
@@ -153,6 +195,130 @@ class TestCase(unittest.TestCase):
                 setattr(cls, target, proxy)
 
 
+async def _run(ctx: Any, procedure: Procedure):
+    # Runs a generator-based sim test from an async testbench, which is what
+    # lets it wait on Changed.
+    response: Any = None
+    exception: Optional[Exception] = None
+    while True:
+        try:
+            if exception is None:
+                command = procedure.send(response)
+            else:
+                command = procedure.throw(exception)
+        except StopIteration:
+            return
+
+        response = exception = None
+        try:
+            match command:
+                case Changed(signals=signals, timeout=None):
+                    await ctx.changed(*signals)
+                    response = True
+                case Changed(signals=signals, timeout=timeout):
+                    expired, *_ = await ctx.delay(timeout).changed(*signals)
+                    response = not expired
+                case Tick(domain=domain):
+                    await ctx.tick(domain)
+                case Delay(interval=interval):
+                    await ctx.delay(interval or 0)
+                case Assign(lhs=lhs, rhs=rhs):
+                    ctx.set(lhs, ctx.get(rhs))
+                case Value() | ValueCastable():
+                    response = ctx.get(command)
+                case _:
+                    raise TypeError(f"unsupported command {command!r}")
+        except Exception as exc:
+            exception = exc
+
+
+def _testbench(bench: Callable[[], Procedure]) -> Callable[[Any], Any]:
+    async def testbench(ctx: Any):
+        await _run(ctx, bench())
+
+    return testbench
+
+
+_snapshots: dict[Any, "Snapshot"] = {}
+
+
+def _booted_testbench(
+    bench: Callable[[], Procedure],
+    boot: Callable[[], Procedure],
+    design: Any,
+    key: Any,
+) -> Callable[[Any], Any]:
+    async def testbench(ctx: Any):
+        snapshot = _snapshots.get(key)
+        if snapshot is None:
+            await _run(ctx, boot())
+            _snapshots[key] = Snapshot.take(ctx, design)
+        else:
+            snapshot.restore(ctx, design)
+        await _run(ctx, bench())
+
+    return testbench
+
+
+class Snapshot:
+    """
+    The value of every signal and memory row in a running simulation, by
+    hierarchical name, so it can be restored into a new simulation of the same
+    design.  Clocks are left alone, as is anything combinatorial; that follows
+    from the rest.
+    """
+
+    signals: dict[tuple[str, ...], int]
+    memories: dict[tuple[str, ...], list[int]]
+
+    def __init__(
+        self,
+        signals: dict[tuple[str, ...], int],
+        memories: dict[tuple[str, ...], list[int]],
+    ):
+        self.signals = signals
+        self.memories = memories
+
+    @staticmethod
+    def _state(
+        design: Any,
+    ) -> tuple[dict[tuple[str, ...], Signal], dict[tuple[str, ...], MemoryData]]:
+        clocks = [domain.clk for domain in design.fragment.domains.values()]
+        signals: dict[tuple[str, ...], Signal] = {}
+        memories: dict[tuple[str, ...], MemoryData] = {}
+        for fragment, info in design.fragments.items():
+            for signal, name in info.signal_names.items():
+                if not any(signal is clk for clk in clocks):
+                    signals[(*info.name, name)] = signal
+            if isinstance(fragment, MemoryInstance):
+                memories[info.name] = fragment._data
+        return signals, memories
+
+    @classmethod
+    def take(cls, ctx: Any, design: Any) -> Self:
+        signals, memories = cls._state(design)
+        return cls(
+            {name: ctx.get(signal) for name, signal in signals.items()},
+            {
+                name: [ctx.get(row) for row in memory]
+                for name, memory in memories.items()
+            },
+        )
+
+    def restore(self, ctx: Any, design: Any):
+        signals, memories = self._state(design)
+        assert signals.keys() == self.signals.keys(), "snapshot of another design"
+        assert memories.keys() == self.memories.keys(), "snapshot of another design"
+        for name, signal in signals.items():
+            try:
+                ctx.set(signal, self.signals[name])
+            except DriverConflict:
+                pass
+        for name, memory in memories.items():
+            for row, value in zip(memory, self.memories[name]):
+                ctx.set(row, value)
+
+
 def args(*args: Any, **kwargs: Any):
     def wrapper(sim_test: Callable[..., Procedure]) -> Callable[..., Procedure]:
         if not hasattr(sim_test, "_sim_args"):
@@ -195,6 +361,37 @@ def always_args(*args: Any, **kwargs: Any):
     return wrapper
 
 
+def processes(factory: Callable[[Any], list[Callable[..., Any]]]):
+    """
+    Add background processes to a sim test's simulator, made by factory from
+    the DUT.
+    """
+
+    def wrapper(sim_test: Callable[..., Procedure]) -> Callable[..., Procedure]:
+        if not hasattr(sim_test, "_sim_processes"):
+            sim_test._sim_processes = []  # pyright: ignore[reportFunctionMemberAccess]
+        sim_test._sim_processes.append(  # pyright: ignore[reportFunctionMemberAccess]
+            factory
+        )
+        return sim_test
+
+    return wrapper
+
+
+def snapshot(boot: Callable[[Any], Procedure]):
+    """
+    Start a sim test from the state boot(dut) leaves the DUT in.  boot is only
+    run once per DUT configuration; later tests restore a snapshot taken after
+    it instead.
+    """
+
+    def wrapper(sim_test: Callable[..., Procedure]) -> Callable[..., Procedure]:
+        sim_test._sim_boot = boot  # pyright: ignore[reportFunctionMemberAccess]
+        return sim_test
+
+    return wrapper
+
+
 def fifo_content(fifo: SyncFIFO) -> Generator[list[int]]:
     content: list[int] = []
 
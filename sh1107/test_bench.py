@@ -0,0 +1,41 @@
+import unittest
+from contextlib import redirect_stderr
+from io import StringIO
+from typing import Any
+
+from .bench import compare
+
+
+def _report(cycles: int, bus_bytes: int) -> dict[str, Any]:
+    return {
+        "clock": 12_000_000,
+        "results": [
+            {
+                "command": "CLS",
+                "speed": 400_000,
+                "cycles": cycles,
+                "bus_bytes": bus_bytes,
+            }
+        ],
+    }
+
+
+class TestBenchCompare(unittest.TestCase):
+    def compare(self, baseline: dict[str, Any], report: dict[str, Any]) -> bool:
+        with redirect_stderr(StringIO()):
+            return compare(baseline, report)
+
+    def test_unchanged(self):
+        self.assertTrue(self.compare(_report(100, 10), _report(100, 10)))
+
+    def test_improved(self):
+        self.assertTrue(self.compare(_report(100, 10), _report(90, 10)))
+
+    def test_regressed(self):
+        self.assertFalse(self.compare(_report(100, 10), _report(101, 10)))
+        self.assertFalse(self.compare(_report(100, 10), _report(90, 11)))
+
+    def test_different_clock(self):
+        report = _report(100, 10)
+        report["clock"] = 3_000_000
+        self.assertFalse(self.compare(_report(100, 10), report))
@@ -0,0 +1,122 @@
+import os
+import tempfile
+import unittest
+
+from amaranth.hdl import Fragment
+from amaranth.sim import Simulator, Tick
+
+from . import sim
+from .bench import BenchTop
+from .platform import Platform
+from .rtl.common import Hz
+from .rtl.oled import OLED
+from .trace import IDLE, fsm_states, trace_sim, trace_vcd
+
+Cm = OLED.Command
+
+
+class TestTrace(unittest.TestCase):
+    def test_fsm_states(self):
+        platform = Platform["test"]
+        dut = BenchTop(platform=platform, speed=Hz(2_000_000))
+        states = fsm_states(Fragment.get(dut, platform))
+        self.assertIn("oled.cmd", states)
+        self.assertIn("oled.chpr", states)
+        self.assertIn("oled.i2c.fsm", states)
+        # Not an FSM.
+        self.assertNotIn("oled._cursor", states)
+
+    def test_sim_matches_vcd(self):
+        platform = Platform["test"]
+        dut = BenchTop(platform=platform, speed=Hz(2_000_000))
+        oled = dut._oled
+
+        def bench() -> sim.Procedure:
+            while (yield oled.result) == OLED.Result.BUSY:
+                yield Tick()
+            yield oled.cmd_bus.w_en.eq(1)
+            for b in [Cm.LOCATE, 2, 3, Cm.PRINT, 1, ord("A")]:
+                yield oled.cmd_bus.w_data.eq(b)
+                yield Tick()
+            yield oled.cmd_bus.w_en.eq(0)
+            yield Tick()
+            while not (yield dut.done):
+                yield Tick()
+
+        fragment = Fragment.get(dut, platform)
+        simulator = Simulator(fragment)
+        simulator.add_clock(sim.clock())
+        simulator.add_testbench(bench)
+        residency = trace_sim(simulator, fragment, oled)
+
+        with tempfile.TemporaryDirectory() as d:
+            vcd_path = os.path.join(d, "trace.vcd")
+            with simulator.write_vcd(vcd_path):
+                simulator.run()
+            from_vcd = trace_vcd(vcd_path)
+
+        commands = residency.to_json()
+        self.assertEqual({"INIT", "LOCATE", "PRINT", IDLE}, set(commands))
+
+        # Every FSM is charged for every cycle.
+        for command in commands.values():
+            self.assertEqual(1, len({sum(fsm.values()) for fsm in command.values()}))
+        self.assertGreater(commands["PRINT"]["oled.chpr"]["IDLE"], 0)
+
+        # The VCD has a few more edges on the end, after the last sample.
+        for key, cycles in residency.cycles.items():
+            self.assertAlmostEqual(cycles, from_vcd.cycles[key], delta=2)
+
+    def test_vcd_numeric(self):
+        # CXXRTL dumps FSM states as plain numbers.
+        platform = Platform["test"]
+        dut = BenchTop(platform=platform, speed=Hz(2_000_000))
+        decoders = fsm_states(Fragment.get(dut, platform))
+        decoder = decoders["oled.cmd"].decoder
+        assert decoder is not None
+
+        vcd = """
+$scope module top $end
+$var wire 1 ! clk $end
+$scope module oled $end
+$var wire 1 " _idle $end
+$var wire 8 # _command $end
+$var wire 6 $ cmd_state $end
+$var wire 1 % _cursor_state $end
+$upscope $end
+$upscope $end
+$enddefinitions $end
+#0
+0!
+0"
+b101 #
+b1 $
+0%
+#1
+1!
+b10 $
+1%
+#2
+0!
+#3
+1!
+1"
+#4
+0!
+#5
+1!
+"""
+        with tempfile.TemporaryDirectory() as d:
+            vcd_path = os.path.join(d, "trace.vcd")
+            with open(vcd_path, "w") as f:
+                f.write(vcd)
+            residency = trace_vcd(vcd_path, decoders)
+
+        self.assertEqual(
+            {
+                ("LOCATE", "oled.cmd", decoder(1).rsplit("/", 1)[0]): 1,
+                ("LOCATE", "oled.cmd", decoder(2).rsplit("/", 1)[0]): 1,
+                (IDLE, "oled.cmd", decoder(2).rsplit("/", 1)[0]): 1,
+            },
+            dict(residency.cycles),
+        )
@@ -0,0 +1,296 @@
+import codecs
+import json
+import re
+from argparse import ArgumentParser, Namespace
+from collections import defaultdict
+from typing import Iterator, Optional
+
+from amaranth import Signal
+from amaranth.hdl import Fragment
+from amaranth.sim import Passive, Simulator, Tick
+
+from .rtl.oled import OLED
+
+__all__ = [
+    "add_main_arguments",
+    "fsm_states",
+    "StateResidency",
+    "trace_sim",
+    "trace_vcd",
+]
+
+# What a cycle's charged to when the OLED isn't running a command.
+IDLE: str = "(idle)"
+
+
+def fsm_states(fragment: Fragment, prefix: str = "") -> dict[str, Signal]:
+    """
+    Every FSM state signal in the design, keyed by dotted hierarchy path and
+    FSM name, e.g. "oled.player.fsm".
+    """
+    found: dict[str, Signal] = {}
+    for stmts in fragment.statements.values():
+        for stmt in stmts:
+            for signal in stmt._lhs_signals():
+                if signal.decoder is not None and signal.name.endswith("_state"):
+                    found[prefix + signal.name.removesuffix("_state")] = signal
+    for i, (subfragment, name, *_) in enumerate(fragment.subfragments):
+        found.update(fsm_states(subfragment, f"{prefix}{name or f'U${i}'}."))
+    return found
+
+
+def _state_name(decoded: str) -> str:
+    # FSM decoders give "NAME/value".
+    return decoded.rsplit("/", 1)[0]
+
+
+class StateResidency:
+    """
+    Cycles spent in each state of each FSM, grouped by the OLED command
+    running at the time.
+    """
+
+    cycles: defaultdict[tuple[str, str, str], int]
+
+    def __init__(self):
+        self.cycles = defaultdict(int)
+
+    def add(self, command: str, fsm: str, state: str, cycles: int = 1):
+        self.cycles[(command, fsm, state)] += cycles
+
+    def to_json(self) -> dict[str, dict[str, dict[str, int]]]:
+        out: dict[str, dict[str, dict[str, int]]] = {}
+        for (command, fsm, state), cycles in sorted(self.cycles.items()):
+            out.setdefault(command, {}).setdefault(fsm, {})[state] = cycles
+        return out
+
+    def to_folded(self) -> str:
+        """
+        One "command;fsm;state cycles" line per entry, as consumed by
+        flamegraph.pl, inferno, speedscope, etc.
+        """
+        return "".join(
+            f"{command};{fsm};{state} {cycles}\n"
+            for (command, fsm, state), cycles in sorted(self.cycles.items())
+        )
+
+    def write(self, prefix: str):
+        with open(f"{prefix}.json", "w") as f:
+            json.dump(self.to_json(), f, indent=2)
+            f.write("\n")
+        with open(f"{prefix}.folded", "w") as f:
+            f.write(self.to_folded())
+
+
+def trace_sim(
+    simulator: Simulator, fragment: Fragment, oled: OLED
+) -> StateResidency:
+    """
+    Add a process to simulator which charges every cycle to the current state
+    of each FSM in fragment, the one simulator was built from.
+    """
+    residency = StateResidency()
+    states = fsm_states(fragment)
+
+    def process():
+        yield Passive()
+        while True:
+            yield Tick()
+            if (yield oled._idle):
+                running = IDLE
+            else:
+                running = _command_name((yield oled._command))
+            for fsm, state in states.items():
+                decoded = state.decoder((yield state))
+                residency.add(running, fsm, _state_name(decoded))
+
+    simulator.add_process(process)
+    return residency
+
+
+def _command_name(value: int) -> str:
+    try:
+        return OLED.Command(value).name
+    except ValueError:
+        return f"0x{value:02x}"
+
+
+_VCD_TOKEN = re.compile(rb"\S+")
+
+
+def _vcd_tokens(path: str) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        for line in f:
+            yield from _VCD_TOKEN.findall(line)
+
+
+def _match(full: str, decoders: dict[str, Signal]) -> Optional[str]:
+    # The VCD's path may have a scope or two of the simulator's own on the
+    # front.
+    parts = full.removesuffix("_state").split(".")
+    for n in range(min(3, len(parts))):
+        candidate = ".".join(parts[n:])
+        if candidate in decoders:
+            return candidate
+    return None
+
+
+def trace_vcd(
+    path: str,
+    decoders: Optional[dict[str, Signal]] = None,
+    *,
+    oled_scope: str = "oled",
+) -> StateResidency:
+    """
+    Build the same histogram from a VCD, one cycle per rising clock edge.
+
+    Amaranth's simulator writes FSM states by name.  CXXRTL (e.g. vsh -v)
+    writes them as numbers, so pass fsm_states() of the same design, as
+    elaborated for that platform, to name them.
+    """
+    residency = StateResidency()
+
+    scope: list[str] = []
+    clk_id: Optional[bytes] = None
+    command_id: Optional[bytes] = None
+    idle_id: Optional[bytes] = None
+    # FSM name for each state signal.  Amaranth dumps them as strings; any
+    # others need a decoder.
+    fsms: dict[bytes, str] = {}
+    encoded: dict[bytes, Signal] = {}
+
+    tokens = _vcd_tokens(path)
+    for token in tokens:
+        if token == b"$scope":
+            next(tokens)
+            scope.append(next(tokens).decode())
+        elif token == b"$upscope":
+            scope.pop()
+        elif token == b"$var":
+            kind = next(tokens)
+            next(tokens)
+            ident = next(tokens)
+            name = next(tokens).decode()
+            full = ".".join(scope + [name])
+            if name == "clk" and clk_id is None:
+                clk_id = ident
+            elif full.endswith(f"{oled_scope}._command"):
+                command_id = ident
+            elif full.endswith(f"{oled_scope}._idle"):
+                idle_id = ident
+            elif not name.endswith("_state"):
+                pass
+            elif kind == b"string":
+                # Drop Amaranth's "bench.top.", leaving the path from the top.
+                fsms[ident] = ".".join(full.removesuffix("_state").split(".")[2:])
+            elif decoders is not None:
+                # Not every *_state is an FSM.
+                if (fsm := _match(full, decoders)) is not None:
+                    fsms[ident] = fsm
+                    encoded[ident] = decoders[fsm]
+        elif token == b"$enddefinitions":
+            break
+
+    assert clk_id is not None, "no clk in VCD"
+
+    def number(raw: str) -> int:
+        try:
+            return int(raw.lstrip("bB"), 2)
+        except ValueError:
+            # x or z.
+            return 0
+
+    def decode(ident: bytes, raw: str) -> str:
+        if raw.startswith("s"):
+            # Amaranth escapes spaces and such as \xNN.
+            return _state_name(codecs.decode(raw[1:], "unicode_escape"))
+        decoder = encoded[ident].decoder
+        assert decoder is not None
+        return _state_name(decoder(number(raw)))
+
+    values: dict[bytes, str] = {}
+
+    def sample():
+        running = IDLE
+        if command_id in values and number(values.get(idle_id, "0")) == 0:
+            running = _command_name(number(values[command_id]))
+        for ident, fsm in fsms.items():
+            if ident in values:
+                residency.add(running, fsm, decode(ident, values[ident]))
+
+    # Changes are applied a timestamp at a time: whatever flops update on a
+    # rising edge is dumped alongside it, and the cycle ending at that edge
+    # should see the values from before it.
+    clk = "0"
+    rising = False
+    changes: dict[bytes, str] = {}
+
+    def step():
+        nonlocal rising
+        if rising:
+            sample()
+            rising = False
+        values.update(changes)
+        changes.clear()
+
+    for token in tokens:
+        first = token[:1]
+        if first == b"#":
+            step()
+            continue
+        if first in b"01xzXZ" and len(token) > 1:
+            ident, value = token[1:], token[:1].decode()
+        elif first in b"bBrRsS":
+            value = token.decode()
+            ident = next(tokens)
+        else:
+            continue
+
+        if ident == clk_id:
+            if clk == "0" and value == "1":
+                rising = True
+            clk = value
+        elif ident in fsms or ident in (command_id, idle_id):
+            changes[ident] = value
+    step()
+
+    return residency
+
+
+def add_main_arguments(parser: ArgumentParser):
+    parser.set_defaults(func=main)
+    parser.add_argument(
+        "vcd",
+        help="VCD to read: from a sim test (build/*.vcd), or vsh -v (vsh.vcd)",
+    )
+    parser.add_argument(
+        "-t",
+        "--top",
+        help="top-level module a vsh VCD was made from, to name its FSM states",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        metavar="PREFIX",
+        help="write PREFIX.json and PREFIX.folded (default: JSON to stdout)",
+    )
+
+
+def main(args: Namespace):
+    decoders = None
+    if args.top:
+        from .build import build_top
+        from .platform import Platform
+
+        # The encoding of each FSM doesn't depend on speed or blackboxing;
+        # whiteboxing everything just means every FSM vsh could have is there.
+        platform = Platform["vsh"]
+        args.speed = OLED.DEFAULT_SPEED_VSH
+        design = build_top(args, platform)
+        decoders = fsm_states(Fragment.get(design, platform))
+
+    residency = trace_vcd(args.vcd, decoders)
+    if args.output:
+        residency.write(args.output)
+    else:
+        print(json.dumps(residency.to_json(), indent=2))
@@ -53,6 +53,13 @@ def add_main_arguments(parser: ArgumentParser):
         action="store_false",
         help="simulate the full SPI protocol for the flash reader; by default it is replaced with a blackbox for speed",
     )
+    parser.add_argument(
+        "-b",
+        "--boot-from-flash",
+        dest="preload_rom",
+        action="store_false",
+        help="copy the ROM in from flash at startup, as on hardware; by default it is preloaded for speed",
+    )
     parser.add_argument(
         "-c",
         "--compile",
@@ -101,6 +108,7 @@ def main(args: Namespace):
     yosys = cast(YosysBinary, find_yosys(lambda ver: ver >= (0, 10)))
 
     platform = Platform["vsh"]
+    platform.preload_rom = args.preload_rom
     design = build_top(args, platform)
 
     black_boxes = {}